@@ -0,0 +1,75 @@
+"""Reference implementations for the tree and array exercise suites.
+
+Generated submissions under ``temp/`` are graded against these. The
+functions mirror the names and return shapes of the student-facing suite
+so results can be compared directly, but they are written to stay fast
+and recursion-free on large stress inputs.
+"""
+
+from .analyzer import TreeAnalysis, analyze_tree
+from .arrays import Array, ArrayView, CustomArray
+from .casefile import CaseFile, CaseWriter, TreeCase, write_cases
+from .compact import CompactTree
+from .dynamic import DynamicTree
+from .lazy import LazyNode, LazyTree
+from .lca import LCAIndex, offline_lca
+from .memo import KeyedNode, SubtreeMemo, construct_keyed_tree, subtree_hash
+from .parallel import parallel_metrics
+from .paths import PathSet
+from .spiral import SpiralOrder
+from .tree import (
+    DiameterPath,
+    TreeNode,
+    construct_binary_tree,
+    construct_binary_tree_from_level_order,
+    construct_binary_tree_with_duplicates,
+    find_diameter_path,
+    find_height_and_diameter,
+    find_lca,
+    is_balanced,
+    iter_all_paths,
+    level_order_spiral,
+    print_all_paths,
+    to_level_order,
+)
+from .validation import TraversalError, validate_traversals
+
+__all__ = [
+    "Array",
+    "ArrayView",
+    "CaseFile",
+    "CaseWriter",
+    "CompactTree",
+    "CustomArray",
+    "DiameterPath",
+    "DynamicTree",
+    "KeyedNode",
+    "LCAIndex",
+    "LazyNode",
+    "LazyTree",
+    "PathSet",
+    "SpiralOrder",
+    "SubtreeMemo",
+    "TreeAnalysis",
+    "TraversalError",
+    "TreeCase",
+    "TreeNode",
+    "analyze_tree",
+    "construct_binary_tree",
+    "construct_binary_tree_from_level_order",
+    "construct_binary_tree_with_duplicates",
+    "construct_keyed_tree",
+    "find_diameter_path",
+    "find_height_and_diameter",
+    "find_lca",
+    "is_balanced",
+    "iter_all_paths",
+    "level_order_spiral",
+    "offline_lca",
+    "parallel_metrics",
+    "print_all_paths",
+    "subtree_hash",
+    "to_level_order",
+    "validate_traversals",
+    "write_cases",
+]
@@ -0,0 +1,20 @@
+"""Helpers that paper over differences between supported Python versions."""
+
+import sys
+
+if sys.version_info >= (3, 10):
+
+    def find(items, value, start, stop):
+        """``items.index(value, start, stop)``."""
+        return items.index(value, start, stop)
+
+else:
+    from array import array
+    from itertools import islice
+    from operator import indexOf
+
+    def find(items, value, start, stop):
+        """``items.index(value, start, stop)``, which ``array`` only takes from Python 3.10."""
+        if items.__class__ is array:
+            return start + indexOf(islice(items, start, stop), value)
+        return items.index(value, start, stop)
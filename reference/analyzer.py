@@ -0,0 +1,104 @@
+"""Single-pass evaluation of every graded tree metric.
+
+The submission harness walks the tree once per metric. :func:`analyze_tree`
+gets height, diameter, balance, spiral order, root-to-leaf paths and the
+LCA of one ``(p, q)`` pair from a single depth-first walk and returns
+them in the shape of ``TestResult.actual`` from ``lib/code-executor.ts``.
+"""
+
+from typing import List, NamedTuple, Optional
+
+
+class TreeAnalysis(NamedTuple):
+    """Field-for-field mirror of ``TestResult.actual``."""
+
+    height: int
+    diameter: int
+    spiral_order: List[List[int]]
+    is_balanced: bool
+    lca_result: Optional[int]
+    paths: List[List[int]]
+
+
+def analyze_tree(root, p, q):
+    """Evaluate all six metrics for ``root``, with the LCA taken for ``(p, q)``.
+
+    One preorder walk extends the current path, records leaf paths and
+    appends each value to its level (preorder meets each level left to
+    right). It also notes which children every node has, and a loop over
+    those notes in reverse preorder, which finishes every child before its
+    parent, folds heights, diameter and balance without touching the
+    nodes again. ``lca_result`` is the LCA's value, using the same rules
+    as ``find_lca``, or ``None``.
+    """
+    if root is None:
+        return TreeAnalysis(0, 0, [], True, None, [])
+    # ``kinds`` gets one entry per node in preorder: bit 0 is set when it
+    # has a left child, bit 1 when it has a right child.
+    kinds, paths, path, levels = [], [], [], []
+    # The LCA so far is path[lca_depth]. ``intact`` is how much of the
+    # path has stayed unchanged since it was set: the walk is below the
+    # LCA exactly while ``intact > lca_depth``.
+    lca_depth, lca_val, intact = -1, None, 0
+    stack = [(root, 0)]
+    pop, push, note, record = stack.pop, stack.append, kinds.append, paths.append
+    while stack:
+        node, depth = pop()
+        val = node.val
+        if depth < len(path):
+            path[depth] = val
+            levels[depth].append(val)
+            if depth < intact:
+                intact = depth
+        else:
+            path.append(val)
+            levels.append([val])
+        if val == p or val == q:
+            # Matches below an earlier match or below the LCA so far
+            # leave it unchanged, as in find_lca.
+            if lca_depth < 0:
+                lca_depth, lca_val = depth, val
+            elif intact <= lca_depth:
+                lca_depth = intact - 1
+                lca_val = path[lca_depth]
+            intact = depth + 1
+        left, right = node.left, node.right
+        depth += 1
+        if right:
+            push((right, depth))
+            if left:
+                push((left, depth))
+                note(3)
+            else:
+                note(2)
+        elif left:
+            push((left, depth))
+            note(1)
+        else:
+            note(0)
+            record(path[:depth])
+
+    # Reverse preorder visits a node's right subtree, then its left one,
+    # then the node, so its children's heights are on top of the stack.
+    heights = []
+    hpop, hpush = heights.pop, heights.append
+    diameter, balanced = 0, True
+    for kind in reversed(kinds):
+        lh = hpop() if kind & 1 else 0
+        rh = hpop() if kind & 2 else 0
+        hpush(1 + (lh if lh > rh else rh))
+        if lh + rh >= diameter:
+            diameter = lh + rh + 1
+        if lh - rh > 1 or rh - lh > 1:
+            balanced = False
+
+    for level in levels[1::2]:
+        level.reverse()
+    return TreeAnalysis(
+        height=heights[0],
+        diameter=diameter,
+        spiral_order=levels,
+        is_balanced=balanced,
+        lca_result=lca_val,
+        paths=paths,
+    )
@@ -0,0 +1,820 @@
+"""Array suite reference: ``Array`` and ``CustomArray``.
+
+The generated array exercises come in two flavours. ``Array`` keeps its
+elements in ``data``, silently ignores out-of-range deletes and sorts
+before every binary search. ``CustomArray`` keeps them in ``array``,
+raises ``IndexError`` for bad positions and returns the list from its
+sorts. Both take ``insert(position, value)``. The classes
+here keep those signatures and results but share one implementation.
+
+The implementation tracks whether the elements are known to be sorted.
+Sorting sets the flag. An insert keeps it only when the new value fits
+between its neighbours, a rotation clears it, and deleting from a
+sorted array leaves it sorted. Sorting already-sorted data is then free,
+so a run of ``Array.binary_search`` calls pays for at most one sort
+instead of a selection sort per call.
+
+A rotation is O(1): it only moves a start offset into the storage, and
+indexing, iteration, search, insert and delete all read through it. The
+storage is rearranged into logical order only when it is handed out
+through the ``data`` or ``array`` list or :meth:`~_ArrayBase.view`; a
+sort simply drops the offset.
+
+Elements live in a plain list by default. ``storage="int64"`` keeps them
+in an ``array('q')`` instead: 8 bytes per element rather than a pointer
+plus a boxed int, and a buffer the harness can take without copying
+through :meth:`~_ArrayBase.view` or :meth:`~_ArrayBase.to_numpy`. Such
+arrays only hold integers that fit in a signed 64-bit word, and ``data``,
+``array`` and the sorts return an :class:`ArrayView`, which prints and
+compares like the list the exercises expect.
+``storage="blocked"`` uses a :class:`BlockList`, which makes positional
+inserts and deletes O(sqrt(n)) instead of O(n) memmoves; it too is handed
+out as an :class:`ArrayView`.
+
+``search_many``, ``insert_many`` and ``delete_many`` give the same results
+as the single calls applied in order. Large batches of inserts or
+deletes are placed with a Fenwick tree over the final slots, and the
+array is then rebuilt in one pass, not with one memmove per operation.
+
+With ``indexed=True``, ``linear_search`` keeps a map from each value to
+its ascending storage positions, and a search is a dict lookup plus,
+after a rotation, a bisect. Positions are physical, so a rotation leaves
+the map valid, as do inserts and deletes at the physical end. Any other
+insert or delete, a sort or a re-layout would shift positions in bulk,
+so it drops the map. Building the map costs about as much as
+``_REINDEX_SCANS`` scans, so it is only rebuilt after that many searches
+in a row have scanned without it. Search-heavy runs soon get the map,
+and runs that keep shifting elements keep scanning, at scan cost.
+"""
+
+from array import array
+from bisect import bisect_left
+from itertools import chain, compress, islice
+from math import isqrt
+from operator import itemgetter
+
+from ._compat import find
+
+STORAGE = ("list", "int64", "blocked")
+
+# search_many scans for batches smaller than this rather than building a
+# value map; a C-level scan costs roughly a tenth of a dict insert.
+_SCAN_BATCH = 16
+
+# insert_many/delete_many place each operation through a Fenwick tree
+# (a few microseconds) and then rebuild the array once. A single
+# list.insert/pop is a memmove that only costs more than that on arrays
+# of roughly _REBUILD_MIN_SIZE elements and up, and the O(n) rebuild only
+# pays off once there are at least n / _REBUILD_RATIO operations to share it.
+_REBUILD_MIN_SIZE = 32768
+_REBUILD_RATIO = 1000
+
+# Building the value index costs roughly 6 to 16 C-level scans, depending
+# on the storage, so it waits for this many scans since it was dropped.
+_REINDEX_SCANS = 16
+
+
+def _insert_index(position, n):
+    """Where ``list.insert`` puts an element asked for at ``position``."""
+    if position < 0:
+        position += n
+        return position if position > 0 else 0
+    return position if position < n else n
+
+
+def _sort_int64(items):
+    """Sort an ``array('q')`` in place, without boxing when NumPy is present."""
+    try:
+        import numpy
+    except ImportError:
+        items[:] = array("q", sorted(items))
+    else:
+        numpy.frombuffer(items, dtype=numpy.int64).sort()
+
+
+def _fenwick(counts):
+    """Build a Fenwick tree (1-based list) over ``counts``."""
+    tree = [0]
+    tree.extend(counts)
+    for i in range(1, len(tree)):
+        parent = i + (i & -i)
+        if parent < len(tree):
+            tree[parent] += tree[i]
+    return tree
+
+
+def _fenwick_ones(size):
+    """Fenwick tree over ``size`` counts of one: node ``i`` holds ``i & -i``.
+
+    That sequence for ``1..2m`` is the one for ``1..m`` twice over with
+    the last entry doubled, so it is built by doubling an ``array('q')`` in C.
+    """
+    tree, top = array("q", [1]), 1
+    while top < size:
+        tree += tree
+        top *= 2
+        tree[-1] = top
+    return array("q", [0]) + tree[:size]
+
+
+def _fenwick_add(tree, slot, delta):
+    i = slot + 1
+    while i < len(tree):
+        tree[i] += delta
+        i += i & -i
+
+
+def _fenwick_locate(tree, index):
+    """Return ``(slot, offset)``: the slot holding the ``index``-th counted unit."""
+    pos, step = 0, 1 << (len(tree) - 1).bit_length()
+    while step:
+        if pos + step < len(tree) and tree[pos + step] <= index:
+            pos += step
+            index -= tree[pos]
+        step >>= 1
+    return pos, index
+
+
+def _rebuild_pays(size, count):
+    """Whether ``count`` positional operations on about ``size`` elements should rebuild."""
+    return size >= _REBUILD_MIN_SIZE and count * _REBUILD_RATIO >= size
+
+
+class BlockList:
+    """List of values split into blocks of ``load`` to ``2 * load`` items.
+
+    Unless ``load`` is given it is about sqrt(n), and the list is
+    re-chunked for the new length whenever its length has doubled or
+    halved since the last chunking, an O(n) pass that is amortized over
+    the n / 2 operations that led to it. A Fenwick tree over the block
+    lengths finds the block holding a position in O(log(n / load))
+    steps, so ``insert``, ``pop`` and indexing cost one
+    ``list.insert``/``list.pop`` inside a block. A block that grows past
+    ``2 * load`` is split in two, and one that shrinks below ``load / 2``
+    is merged into a neighbour. Either way the tree is rebuilt in
+    O(n / load), which happens at most once every ``load / 2``
+    operations. Supports the subset of the list API the arrays use.
+    """
+
+    __slots__ = ("_blocks", "_tree", "_len", "_load", "_fixed_load", "_chunked_len")
+
+    MIN_LOAD = 64
+
+    def __init__(self, values=(), load=None):
+        self._fixed_load = load
+        self._chunk(list(values))
+
+    def _chunk(self, values):
+        n = len(values)
+        load = self._fixed_load or max(self.MIN_LOAD, isqrt(n))
+        self._load = load
+        self._chunked_len = n
+        self._blocks = [values[i:i + load] for i in range(0, n, load)]
+        self._len = n
+        self._build()
+
+    def _retune(self):
+        """Re-chunk if the length now calls for another load; return whether it did."""
+        if self._fixed_load or max(self.MIN_LOAD, isqrt(self._len)) == self._load:
+            self._chunked_len = self._len
+            return False
+        self._chunk(list(self))
+        return True
+
+    def _build(self):
+        self._tree = _fenwick(map(len, self._blocks))
+
+    def _add(self, block, delta):
+        _fenwick_add(self._tree, block, delta)
+
+    def _locate(self, index):
+        """Return ``(block, offset)`` of position ``0 <= index < len``."""
+        return _fenwick_locate(self._tree, index)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return chain.from_iterable(self._blocks)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("list index out of range")
+        block, offset = self._locate(index)
+        return self._blocks[block][offset]
+
+    def insert(self, index, value):
+        """Insert ``value`` before ``index``, with ``list.insert`` semantics."""
+        index = _insert_index(index, self._len)
+        if not self._blocks:
+            self._chunk([value])
+            return
+        if index == self._len:
+            block = len(self._blocks) - 1
+            offset = len(self._blocks[block])
+        else:
+            block, offset = self._locate(index)
+        items = self._blocks[block]
+        items.insert(offset, value)
+        self._len += 1
+        if self._len >= 2 * self._chunked_len and self._retune():
+            return
+        if len(items) > 2 * self._load:
+            self._blocks[block:block + 1] = [items[:self._load], items[self._load:]]
+            self._build()
+        else:
+            self._add(block, 1)
+
+    def pop(self, index=-1):
+        """Remove and return the value at ``index``."""
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("pop index out of range")
+        blocks = self._blocks
+        block, offset = self._locate(index)
+        items = blocks[block]
+        value = items.pop(offset)
+        self._len -= 1
+        if 2 * self._len <= self._chunked_len and self._retune():
+            return value
+        if len(items) < self._load // 2 and len(blocks) > 1:
+            other = block + 1 if block + 1 < len(blocks) else block - 1
+            lo = min(block, other)
+            merged = blocks[lo] + blocks[lo + 1]
+            if len(merged) > 2 * self._load:
+                half = len(merged) // 2
+                blocks[lo:lo + 2] = [merged[:half], merged[half:]]
+            else:
+                blocks[lo:lo + 2] = [merged]
+            self._build()
+        elif not items:
+            del blocks[block]
+            self._build()
+        else:
+            self._add(block, -1)
+        return value
+
+    def index(self, value, start=0, stop=None):
+        """Return the first position of ``value`` in ``[start, stop)``, like ``list.index``."""
+        n = self._len
+        start = _insert_index(start, n)
+        stop = n if stop is None else _insert_index(stop, n)
+        if start < stop:
+            block, offset = self._locate(start)
+            base = start - offset
+            for items in islice(self._blocks, block, None):
+                if base >= stop:
+                    break
+                try:
+                    return base + items.index(value, offset, stop - base)
+                except ValueError:
+                    pass
+                base += len(items)
+                offset = 0
+        raise ValueError(f"{value!r} is not in list")
+
+    def sort(self):
+        """Sort ascending and re-chunk for the current length."""
+        values = list(self)
+        values.sort()
+        self._chunk(values)
+
+
+def _searchsorted_int64(items, values):
+    """Batch first-position lookup in a sorted ``array('q')``, or ``None``.
+
+    ``None`` means NumPy is missing or ``values`` are not all int64, and
+    the caller should fall back to ``bisect``.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    probe = numpy.array(values)
+    if probe.dtype.kind != "i":
+        return None
+    data = numpy.frombuffer(items, dtype=numpy.int64)
+    found = numpy.searchsorted(data, probe)
+    hit = found < len(data)
+    hit[hit] = data[found[hit]] == probe[hit]
+    return numpy.where(hit, found, -1).tolist()
+
+
+class ArrayView:
+    """Live, read-only view of an array's elements in logical order.
+
+    ``CustomArray.rotate`` returns one instead of the list, which would
+    have to be rearranged physically, and ``data``, ``array`` and the
+    sorts return one for storage that is not a list. It prints and
+    compares equal like that list; ``list(view)`` takes a copy.
+    """
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner):
+        self._owner = owner
+
+    def __len__(self):
+        return len(self._owner)
+
+    def __iter__(self):
+        return iter(self._owner)
+
+    def __getitem__(self, index):
+        return self._owner[index]
+
+    def __eq__(self, other):
+        if isinstance(other, ArrayView):
+            other = list(other)
+        return list(self) == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class _ArrayBase:
+    def __init__(self, values=(), storage="list", indexed=False):
+        if storage not in STORAGE:
+            raise ValueError(f"unknown storage {storage!r}; expected one of {', '.join(STORAGE)}")
+        self.storage = storage
+        self.indexed = indexed
+        self._assign(values)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        items, start = self._items, self._start
+        return chain(islice(items, start, None), islice(items, start))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._normalized()[index]
+        n = len(self._items)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("array index out of range")
+        return self._items[(self._start + index) % n]
+
+    def _normalized(self):
+        """Physically apply a pending rotation and return the storage."""
+        start = self._start
+        if start:
+            items = self._items
+            self._items = self._storage(chain(islice(items, start, None), islice(items, start)))
+            self._start = 0
+            self._drop_index()
+        return self._items
+
+    def _exposed(self):
+        """Return the elements for ``data``, ``array`` and the sorts.
+
+        List storage hands out the list itself, as the exercises do. Other
+        storage would hand out its own type, which prints and compares
+        differently, so it gets an :class:`ArrayView` instead; the
+        zero-copy buffer stays available through :meth:`view`.
+        """
+        if self.storage != "list":
+            return ArrayView(self)
+        return self._normalized()
+
+    def view(self):
+        """Zero-copy ``memoryview`` over the elements; ``int64`` storage only.
+
+        While a view (or a NumPy array from :meth:`to_numpy`) is alive the
+        buffer cannot be resized, so inserts and deletes raise
+        ``BufferError`` until it is released.
+        """
+        if self.storage != "int64":
+            raise TypeError(f"{self.storage} storage has no buffer; use storage='int64'")
+        return memoryview(self._normalized())
+
+    def to_numpy(self):
+        """Zero-copy int64 NumPy array over the elements; requires NumPy."""
+        import numpy
+
+        return numpy.frombuffer(self.view(), dtype=numpy.int64)
+
+    def __buffer__(self, flags):
+        # PEP 688: lets memoryview(arr) and numpy.asarray(arr) share the
+        # buffer directly on Python 3.12+.
+        return self.view()
+
+    def _mark_unsorted(self):
+        # Short or empty arrays are trivially sorted; anything else is
+        # unknown until the next sort.
+        self._sorted = len(self._items) < 2
+
+    def _storage(self, values):
+        if self.storage == "list":
+            return list(values)
+        if self.storage == "int64":
+            return array("q", values)
+        return BlockList(values)
+
+    def _assign(self, values):
+        self._items = self._storage(values)
+        self._start = 0
+        self._drop_index()
+        self._mark_unsorted()
+
+    def _insert(self, position, value):
+        items, start = self._items, self._start
+        n = len(items)
+        i = _insert_index(position, n)
+        still_sorted = False
+        if self._sorted:
+            try:
+                still_sorted = (i == 0 or self[i - 1] <= value) and (i == n or value <= self[i])
+            except TypeError:
+                pass
+        # Logical position i is physical start + i. Past the end of the
+        # storage it lands in the wrapped-around head, before the start,
+        # which then moves up by one.
+        j = start + i
+        # The storage goes first: int64 storage rejects values it cannot
+        # hold, and nothing else may change when it does.
+        items.insert(j - n if j > n else j, value)
+        if j > n:
+            self._start = start + 1
+        self._sorted = still_sorted
+        if j != n:
+            self._drop_index()
+        elif self._index is not None:
+            try:
+                self._index_add(value, j)
+            except TypeError:
+                self._drop_index()
+
+    def _delete(self, position):
+        items, start = self._items, self._start
+        j = (start + position) % len(items)
+        value = items.pop(j)
+        if j != len(items):
+            self._drop_index()
+        elif self._index is not None:
+            self._index_remove(value)
+        if j < start:
+            start -= 1
+        self._start = start if start < len(items) else 0
+
+    def _rotate(self, k):
+        n = len(self._items)
+        if not n:
+            return
+        k %= n
+        if k:
+            self._start = (self._start - k) % n
+            self._mark_unsorted()
+
+    def _sort(self):
+        if not self._sorted:
+            # The order of the elements is about to be discarded, and so
+            # is any pending rotation.
+            self._start = 0
+            self._drop_index()
+            if self.storage == "int64":
+                _sort_int64(self._items)
+            else:
+                self._items.sort()
+            self._sorted = True
+
+    def _drop_index(self):
+        self._index = None
+        self._scans = 0
+
+    def _positions(self):
+        """Return the value -> storage positions map, building it if needed.
+
+        An entry is a bare int for a value held once and an ascending list
+        otherwise, which keeps the map small for mostly distinct values.
+        """
+        if self._index is None:
+            index = {}
+            for i, value in enumerate(self._items):
+                entry = index.get(value)
+                if entry is None:
+                    index[value] = i
+                elif entry.__class__ is int:
+                    index[value] = [entry, i]
+                else:
+                    entry.append(i)
+            self._index = index
+        return self._index
+
+    def _index_add(self, value, position):
+        # Only called for the last storage position, so lists stay ascending.
+        index = self._index
+        entry = index.get(value)
+        if entry is None:
+            index[value] = position
+        elif entry.__class__ is int:
+            index[value] = [entry, position]
+        else:
+            entry.append(position)
+
+    def _index_remove(self, value):
+        # The mirror of _index_add: removes the last storage position.
+        index = self._index
+        entry = index[value]
+        if entry.__class__ is int:
+            del index[value]
+        else:
+            entry.pop()
+            if len(entry) == 1:
+                index[value] = entry[0]
+
+    def linear_search(self, value):
+        """Return the index of the first ``value``, or -1."""
+        items, start = self._items, self._start
+        if self.indexed and self._index is None and self._scans < _REINDEX_SCANS:
+            self._scans += 1
+        elif self.indexed:
+            try:
+                entry = self._positions().get(value)
+            except TypeError:
+                # An unhashable value, or elements that cannot be indexed
+                # (then wait as long as after a drop before trying again);
+                # the scan below handles both.
+                if self._index is None:
+                    self._scans = 0
+            else:
+                if entry is None:
+                    return -1
+                if entry.__class__ is not int:
+                    # The first logical occurrence is the first position at
+                    # or after the start, wrapping round to the lowest one.
+                    k = bisect_left(entry, start) if start else 0
+                    entry = entry[k] if k < len(entry) else entry[0]
+                return (entry - start) % len(items)
+        n = len(items)
+        try:
+            return find(items, value, start, n) - start
+        except ValueError:
+            pass
+        try:
+            return find(items, value, 0, start) + n - start
+        except ValueError:
+            return -1
+
+    def _bisect(self, value):
+        # The suite's own probe sequence, so arrays with duplicates report
+        # the same index the exercises do.
+        items, start = self._items, self._start
+        n = len(items)
+        low, high = 0, n - 1
+        while low <= high:
+            mid = (low + high) // 2
+            item = items[mid + start if mid + start < n else mid + start - n]
+            if item == value:
+                return mid
+            if item < value:
+                low = mid + 1
+            else:
+                high = mid - 1
+        return -1
+
+    def search_many(self, values):
+        """Return ``[self.linear_search(value) for value in values]``, batched.
+
+        Known-sorted data answers from a binary search per value, with
+        NumPy's ``searchsorted`` for int64 storage when NumPy is present;
+        a value that does not compare with the elements gets ``-1``.
+        Otherwise an ``indexed`` array uses its value index, and any other
+        batch of at least ``_SCAN_BATCH`` values builds a one-off
+        first-position map; smaller batches, and unhashable values or
+        elements, just scan.
+        """
+        values = list(values)
+        items = self._items
+        n = len(items)
+        if not n or not values:
+            return [-1] * len(values)
+        if self._sorted and not self._start:
+            if self.storage == "int64":
+                found = _searchsorted_int64(items, values)
+                if found is not None:
+                    return found
+            result = []
+            for value in values:
+                try:
+                    i = bisect_left(items, value)
+                except TypeError:
+                    # Does not order against the elements, so it equals none
+                    # of them either, as linear_search would find.
+                    result.append(-1)
+                    continue
+                result.append(i if i < n and items[i] == value else -1)
+            return result
+        if self.indexed or len(values) < _SCAN_BATCH:
+            return [self.linear_search(value) for value in values]
+        # Later keys win in a dict, so walking backwards leaves each
+        # value's first position.
+        try:
+            first = dict(zip(reversed(list(self)), range(n - 1, -1, -1)))
+        except TypeError:
+            # Unhashable elements; only scanning can find them.
+            return [self.linear_search(value) for value in values]
+        result = []
+        for value in values:
+            try:
+                result.append(first.get(value, -1))
+            except TypeError:
+                result.append(self.linear_search(value))
+        return result
+
+    def _insert_many(self, positions, values, strict):
+        positions, values = list(positions), list(values)
+        if len(positions) != len(values):
+            raise ValueError("positions and values differ in length")
+        n = len(self._items)
+        slots, error = [], None
+        for k, position in enumerate(positions):
+            if not strict:
+                position = _insert_index(position, n + k)
+            elif position < 0 or position > n + k:
+                error = IndexError("Position out of bounds")
+                break
+            slots.append(position)
+        if not _rebuild_pays(n + len(slots) // 2, len(slots)):
+            for position, value in zip(slots, values):
+                self._insert(position, value)
+        elif slots:
+            # Place the inserts last to first. The k-th insert lands on
+            # the slot that is its position among those not taken by
+            # later inserts. The original elements fill the runs between
+            # the placed slots, in order.
+            tree = _fenwick_ones(n + len(slots))
+            placed = []
+            for k in range(len(slots) - 1, -1, -1):
+                slot, _ = _fenwick_locate(tree, slots[k])
+                _fenwick_add(tree, slot, -1)
+                placed.append((slot, values[k]))
+            placed.sort(key=itemgetter(0))
+            old, final, used = list(self), [], 0
+            for slot, value in placed:
+                run = slot - len(final)
+                final += old[used:used + run]
+                used += run
+                final.append(value)
+            final += old[used:]
+            self._assign(final)
+        if error is not None:
+            raise error
+
+    def _delete_many(self, positions, strict):
+        n = len(self._items)
+        positions = list(positions)
+        if not _rebuild_pays(n - len(positions) // 2, len(positions)):
+            for position in positions:
+                if 0 <= position < len(self._items):
+                    self._delete(position)
+                elif strict:
+                    raise IndexError("Position out of bounds")
+            return
+        tree = _fenwick_ones(n)
+        keep, alive, error = bytearray(b"\x01") * n, n, None
+        for position in positions:
+            if not 0 <= position < alive:
+                if strict:
+                    error = IndexError("Position out of bounds")
+                    break
+                continue
+            slot, _ = _fenwick_locate(tree, position)
+            _fenwick_add(tree, slot, -1)
+            keep[slot] = 0
+            alive -= 1
+        if alive < n:
+            # Deleting never unsorts, so a sorted array stays sorted.
+            was_sorted = self._sorted
+            self._assign(compress(self, keep))
+            self._sorted = self._sorted or was_sorted
+        if error is not None:
+            raise error
+
+
+class Array(_ArrayBase):
+    """Reference for the ``Array`` exercise (``temp/test_1734852026830.py``).
+
+    ``data`` reads the elements as a list, or as an :class:`ArrayView`
+    with ``int64`` or ``blocked`` storage. Assigning to it is supported, but mutating
+    the returned list in place bypasses the sorted flag.
+    """
+
+    @property
+    def data(self):
+        return self._exposed()
+
+    @data.setter
+    def data(self, values):
+        self._assign(values)
+
+    def insert(self, position, value):
+        """Insert ``value`` at ``position`` with ``list.insert`` semantics."""
+        self._insert(position, value)
+
+    def delete(self, position):
+        """Delete the value at ``position``; out-of-range positions are ignored."""
+        if 0 <= position < len(self._items):
+            self._delete(position)
+
+    def insert_many(self, positions, values):
+        """Same as ``insert(positions[k], values[k])`` for each ``k`` in turn."""
+        self._insert_many(positions, values, strict=False)
+
+    def delete_many(self, positions):
+        """Same as ``delete(position)`` for each position in turn."""
+        self._delete_many(positions, strict=False)
+
+    def binary_search(self, value):
+        """Sort if needed, then binary search; return an index or -1."""
+        self._sort()
+        return self._bisect(value)
+
+    def bubble_sort(self):
+        """Sort ascending."""
+        self._sort()
+
+    def selection_sort(self):
+        """Sort ascending."""
+        self._sort()
+
+    def rotate(self, k):
+        """Rotate right by ``k`` positions; a no-op on an empty array."""
+        self._rotate(k)
+
+
+class CustomArray(_ArrayBase):
+    """Reference for the ``CustomArray`` exercise (``temp/test_1734812779491.py``).
+
+    ``array`` reads the elements like ``Array.data``, with the same
+    caveat.
+    """
+
+    @property
+    def array(self):
+        return self._exposed()
+
+    @array.setter
+    def array(self, values):
+        self._assign(values)
+
+    def insert(self, position, value):
+        """Insert ``value`` at ``position``; raises ``IndexError`` outside ``[0, len]``."""
+        if position < 0 or position > len(self._items):
+            raise IndexError("Position out of bounds")
+        self._insert(position, value)
+
+    def delete(self, position):
+        """Delete the value at ``position``; raises ``IndexError`` if out of range."""
+        if position < 0 or position >= len(self._items):
+            raise IndexError("Position out of bounds")
+        self._delete(position)
+
+    def insert_many(self, positions, values):
+        """Same as ``insert(positions[k], values[k])`` for each ``k`` in turn.
+
+        An out-of-bounds position raises ``IndexError`` after the inserts
+        before it have been applied, as the single calls would.
+        """
+        self._insert_many(positions, values, strict=True)
+
+    def delete_many(self, positions):
+        """Same as ``delete(position)`` for each position in turn.
+
+        An out-of-range position raises ``IndexError`` after the deletes
+        before it have been applied, as the single calls would.
+        """
+        self._delete_many(positions, strict=True)
+
+    def binary_search(self, value):
+        """Binary search, assuming sorted data as the exercise does; index or -1."""
+        return self._bisect(value)
+
+    def bubble_sort(self):
+        """Sort ascending and return ``array``."""
+        self._sort()
+        return self._exposed()
+
+    def selection_sort(self):
+        """Sort ascending and return ``array``."""
+        self._sort()
+        return self._exposed()
+
+    def rotate(self, k):
+        """Rotate right by ``k`` positions and return an :class:`ArrayView`.
+
+        The exercise returns ``array``; the view prints and compares like
+        it without undoing the O(1) rotation. A no-op on an empty array.
+        """
+        self._rotate(k)
+        return ArrayView(self)
@@ -0,0 +1,722 @@
+"""Benchmarks for the reference suites.
+
+Run one with ``python -m reference.bench <name>``; ``--help`` lists them.
+Every benchmark compares the reference implementation against the
+student-facing baseline in :mod:`reference.legacy` and checks that both
+produce the same result before reporting timings.
+"""
+
+import argparse
+import ast
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from array import array
+
+from . import legacy, tree
+from .analyzer import analyze_tree
+from .arrays import Array, CustomArray
+from .casefile import CaseFile, write_cases
+from .compact import CompactTree
+from .dynamic import DynamicTree
+from .generator import random_traversals
+from .lazy import LazyTree
+from .lca import LCAIndex, offline_lca
+from .memo import SubtreeMemo, construct_keyed_tree
+from .parallel import parallel_metrics
+from .paths import PathSet
+from .spiral import SpiralOrder
+from .tree import construct_binary_tree
+
+DEFAULT_SIZES = "1000,10000,100000,1000000"
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def _sizes(text):
+    return [int(float(part)) for part in text.split(",") if part]
+
+
+def _report(n, baseline, reference, names=("legacy", "reference")):
+    old, new = names
+    if baseline is None or isinstance(baseline, str):
+        print(f"n={n:>9}  {old}={baseline or 'skipped':>10}  {new}={reference:9.4f}s")
+    else:
+        speedup = baseline / reference if reference else float("inf")
+        print(f"n={n:>9}  {old}={baseline:9.4f}s  {new}={reference:9.4f}s  speedup={speedup:8.1f}x")
+
+
+def _same_tree(a, b):
+    stack = [(a, b)]
+    while stack:
+        x, y = stack.pop()
+        if x is None or y is None:
+            if x is not y:
+                return False
+            continue
+        if x.val != y.val:
+            return False
+        stack.append((x.left, y.left))
+        stack.append((x.right, y.right))
+    return True
+
+
+def bench_build(args):
+    """construct_binary_tree: slicing/pop(0) builder vs index map + cursor."""
+    for n in args.sizes:
+        preorder, inorder = random_traversals(n, args.seed)
+        reference, root = _timed(construct_binary_tree, preorder, inorder)
+        baseline = None
+        if n <= args.legacy_max:
+            baseline, expected = _timed(legacy.construct_binary_tree, preorder[:], inorder[:])
+            assert _same_tree(root, expected)
+        _report(n, baseline, reference)
+
+
+def _run_suite(module, root, p, q):
+    lca = module.find_lca(root, p, q)
+    return (
+        module.find_height_and_diameter(root),
+        module.is_balanced(root),
+        lca.val if lca else None,
+        module.print_all_paths(root),
+    )
+
+
+def bench_traverse(args):
+    """Height/diameter, balance, LCA and paths on a left-skewed chain."""
+    for n in args.sizes:
+        root = construct_binary_tree(list(range(n)), list(range(n - 1, -1, -1)))
+        reference, result = _timed(_run_suite, tree, root, n - 1, n // 2)
+        baseline = None
+        if n <= args.legacy_max:
+            try:
+                baseline, expected = _timed(_run_suite, legacy, root, n - 1, n // 2)
+            except RecursionError:
+                baseline = "RecursionError"
+            else:
+                assert result == expected
+        _report(n, baseline, reference)
+
+
+def _retained_bytes(fn, *args):
+    """Bytes still allocated by ``fn`` once it returns, i.e. held by its result."""
+    tracemalloc.start()
+    try:
+        result = fn(*args)
+        return tracemalloc.get_traced_memory()[0], result
+    finally:
+        tracemalloc.stop()
+
+
+def _peak_bytes(fn, *args):
+    """Peak bytes allocated while ``fn`` runs."""
+    tracemalloc.start()
+    try:
+        result = fn(*args)
+        return tracemalloc.get_traced_memory()[1], result
+    finally:
+        tracemalloc.stop()
+
+
+def bench_compact(args):
+    """TreeNode vs CompactTree: build memory and the full metric suite."""
+    for n in args.sizes:
+        preorder, inorder = random_traversals(n, args.seed)
+        node_bytes, root = _retained_bytes(construct_binary_tree, preorder, inorder)
+        compact_bytes, compact = _retained_bytes(CompactTree.from_traversals, preorder, inorder)
+        print(
+            f"n={n:>9}  TreeNode={node_bytes / n:7.1f} B/node  "
+            f"CompactTree={compact_bytes / n:7.1f} B/node  ratio={node_bytes / compact_bytes:5.1f}x"
+        )
+
+        def node_suite():
+            return (
+                tree.find_height_and_diameter(root), tree.is_balanced(root),
+                tree.level_order_spiral(root), tree.print_all_paths(root),
+            )
+
+        def compact_suite():
+            return (
+                compact.height_and_diameter(), compact.is_balanced(),
+                compact.spiral_order(), compact.paths(),
+            )
+
+        baseline, expected = _timed(node_suite)
+        reference, result = _timed(compact_suite)
+        assert result == expected
+        _report(n, baseline, reference, ("TreeNode", "CompactTree"))
+
+
+def _legacy_harness(root, p, q):
+    height, diameter = legacy.find_height_and_diameter(root)
+    lca = legacy.find_lca(root, p, q)
+    return (
+        height, diameter, legacy.level_order_spiral(root), legacy.is_balanced(root),
+        lca.val if lca else None, legacy.print_all_paths(root),
+    )
+
+
+def bench_analyze(args):
+    """Five separate legacy walks vs the fused analyze_tree pass."""
+    for n in args.sizes:
+        preorder, inorder = random_traversals(n, args.seed)
+        root = construct_binary_tree(preorder, inorder)
+        p, q = preorder[-1], inorder[-1]
+        reference, result = _timed(analyze_tree, root, p, q)
+        baseline = None
+        if n <= args.legacy_max:
+            baseline, expected = _timed(_legacy_harness, root, p, q)
+            assert tuple(result) == expected
+        _report(n, baseline, reference)
+
+
+def bench_lca(args):
+    """Repeated find_lca calls vs LCAIndex.query_many and offline_lca.
+
+    The legacy side is timed on ``--sample`` queries and extrapolated to
+    ``--queries``; running all of them would take hours at 10^5 nodes.
+    """
+    for n in args.sizes:
+        preorder, inorder = random_traversals(n, args.seed)
+        root = construct_binary_tree(preorder, inorder)
+        rng = random.Random(args.seed)
+        pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(args.queries)]
+
+        def indexed():
+            return LCAIndex(root).query_many(pairs)
+
+        reference, result = _timed(indexed)
+        offline, offline_result = _timed(offline_lca, root, pairs)
+        assert offline_result == result
+        sample = pairs[:args.sample]
+        baseline, expected = _timed(lambda: [legacy.find_lca(root, p, q) for p, q in sample])
+        assert result[:len(sample)] == expected
+        baseline *= len(pairs) / max(len(sample), 1)
+        print(f"n={n:>9}  queries={len(pairs)}  legacy extrapolated from {len(sample)} queries")
+        _report(n, baseline, reference, ("legacy", "LCAIndex"))
+        _report(n, baseline, offline, ("legacy", "offline_lca"))
+
+
+def bench_paths(args):
+    """Peak memory of print_all_paths vs streaming and PathSet encoding."""
+    for n in args.sizes:
+        preorder, inorder = random_traversals(n, args.seed)
+        root = construct_binary_tree(preorder, inorder)
+
+        def stream():
+            return sum(len(path) for path in tree.iter_all_paths(root))
+
+        listed, paths = _peak_bytes(tree.print_all_paths, root)
+        streamed, total = _peak_bytes(stream)
+        encoded, path_set = _peak_bytes(PathSet.from_node, root)
+        assert total == sum(map(len, paths))
+        assert list(path_set) == paths
+        del paths
+        print(
+            f"n={n:>9}  list={listed / 2**20:8.1f} MiB  "
+            f"stream={streamed / 2**20:8.2f} MiB  PathSet={encoded / 2**20:8.1f} MiB"
+        )
+
+
+def bench_spiral(args):
+    """Nested-list level_order_spiral vs the flat SpiralOrder buffer."""
+    for n in args.sizes:
+        preorder, inorder = random_traversals(n, args.seed)
+        root = construct_binary_tree(preorder, inorder)
+        listed, expected = _retained_bytes(legacy.level_order_spiral, root)
+        flat, spiral = _retained_bytes(SpiralOrder.from_node, root)
+        assert spiral.to_lists() == expected
+        print(f"n={n:>9}  lists={listed / n:6.1f} B/node  SpiralOrder={flat / n:6.1f} B/node")
+        baseline, _ = _timed(legacy.level_order_spiral, root)
+        reference, _ = _timed(SpiralOrder.from_node, root)
+        _report(n, baseline, reference)
+
+
+def bench_vectorized(args):
+    """Per-node legacy closures vs level-at-a-time NumPy metrics (needs NumPy).
+
+    Try ``--sizes 10,100,1000,10000,100000,1000000`` to find the
+    crossover; the NumPy side starts from an already array-backed tree.
+    """
+    from . import vectorized
+
+    def node_metrics(root):
+        height, diameter = legacy.find_height_and_diameter(root)
+        return height, diameter, legacy.level_order_spiral(root), legacy.is_balanced(root)
+
+    for n in args.sizes:
+        preorder, inorder = random_traversals(n, args.seed)
+        root = construct_binary_tree(preorder, inorder)
+        compact = CompactTree.from_traversals(preorder, inorder)
+        baseline, expected = _timed(node_metrics, root)
+        reference, result = _timed(vectorized.tree_metrics, compact)
+        assert result == expected
+        _report(n, baseline, reference, ("dfs", "numpy"))
+
+
+def bench_memo(args):
+    """Regrade simulation: the same tree rebuilt and evaluated 20 times.
+
+    Times the builds and the metric walks separately; keyed builds pay
+    for the subtree keys up front.
+    """
+    for n in args.sizes:
+        preorder, inorder = random_traversals(n, args.seed)
+        build, roots = _timed(lambda: [construct_binary_tree(preorder, inorder) for _ in range(20)])
+        keyed_build, keyed = _timed(lambda: [construct_keyed_tree(preorder, inorder) for _ in range(20)])
+        memo = SubtreeMemo()
+
+        def plain():
+            return [(tree.find_height_and_diameter(r), tree.is_balanced(r)) for r in roots]
+
+        def memoized():
+            return [(tree.find_height_and_diameter(r, memo), tree.is_balanced(r, memo)) for r in keyed]
+
+        baseline, expected = _timed(plain)
+        reference, result = _timed(memoized)
+        assert result == expected
+        _report(n, build, keyed_build, ("build", "keyed build"))
+        _report(n, baseline, reference, ("plain", "memo"))
+        _report(n, build + baseline, keyed_build + reference, ("plain total", "memo total"))
+        print(f"n={n:>9}  {memo.info()}")
+
+
+def bench_casefile(args):
+    """Parsing list literals vs mmap-loading a case file; sizes are case counts."""
+    for count in args.sizes:
+        rng = random.Random(args.seed)
+        cases = [random_traversals(rng.randint(5, 200), seed) for seed in range(count)]
+        literals = [(repr(pre), repr(ino)) for pre, ino in cases]
+        fd, path = tempfile.mkstemp(suffix=".cases")
+        os.close(fd)
+        try:
+            write_cases(path, ((pre, ino, []) for pre, ino in cases))
+
+            def parsed():
+                return [
+                    legacy.construct_binary_tree(ast.literal_eval(pre), ast.literal_eval(ino))
+                    for pre, ino in literals
+                ]
+
+            def mapped():
+                with CaseFile(path) as case_file:
+                    return [case.tree() for case in case_file]
+
+            def opened():
+                with CaseFile(path) as case_file:
+                    return len(case_file)
+
+            baseline, _ = _timed(parsed)
+            reference, _ = _timed(mapped)
+            open_time, _ = _timed(opened)
+            print(f"cases={count:>7}  open={open_time * 1000:7.2f} ms")
+            _report(count, baseline, reference, ("literals", "casefile"))
+        finally:
+            os.unlink(path)
+
+
+def bench_lazy(args):
+    """Eager build vs LazyTree for a shallow LCA and the first three spiral levels."""
+    for n in args.sizes:
+        preorder, inorder = random_traversals(n, args.seed)
+        eager_root = construct_binary_tree(preorder, inorder)
+        p, q = eager_root.left.left.val, eager_root.right.val
+
+        def eager():
+            root = construct_binary_tree(preorder, inorder)
+            return tree.find_lca(root, p, q).val, tree.level_order_spiral(root)[:3]
+
+        def lazy():
+            lazy_tree = LazyTree(preorder, inorder)
+            result = lazy_tree.lca(p, q).val, lazy_tree.spiral_order(3)
+            return result, lazy_tree.materialized
+
+        baseline, expected = _timed(eager)
+        reference, (result, materialized) = _timed(lazy)
+        assert result == expected
+        print(f"n={n:>9}  materialized={materialized}")
+        _report(n, baseline, reference, ("eager", "lazy"))
+
+
+def _random_mutations(preorder, inorder, steps, seed):
+    """Return ``steps`` valid leaf mutations: ``(parent, value, right)`` inserts or ``(value,)`` deletes."""
+    rng = random.Random(seed)
+    shadow = DynamicTree(construct_binary_tree(preorder, inorder))
+    values, next_value, ops = list(preorder), len(preorder), []
+    while len(ops) < steps:
+        i = rng.randrange(len(values))
+        node = shadow.node(values[i])
+        if not node.left and not node.right and len(values) > 1 and rng.random() < 0.5:
+            shadow.delete(node.val)
+            values[i] = values[-1]
+            values.pop()
+            ops.append((node.val,))
+        elif node.left is None or node.right is None:
+            right = node.left is not None
+            shadow.insert(node.val, next_value, right)
+            values.append(next_value)
+            ops.append((node.val, next_value, right))
+            next_value += 1
+    return ops
+
+
+def bench_dynamic(args):
+    """Recomputing metrics after each leaf mutation vs DynamicTree.
+
+    The recompute side is timed on ``--sample`` steps and extrapolated
+    to ``--queries`` steps.
+    """
+    for n in args.sizes:
+        preorder, inorder = random_traversals(n, args.seed)
+        ops = _random_mutations(preorder, inorder, args.queries, args.seed)
+
+        def incremental():
+            dynamic = DynamicTree(construct_binary_tree(preorder, inorder))
+            results = []
+            for op in ops:
+                if len(op) == 1:
+                    dynamic.delete(op[0])
+                else:
+                    dynamic.insert(*op)
+                results.append((dynamic.height, dynamic.diameter, dynamic.is_balanced))
+            return results
+
+        def recompute(steps):
+            root = construct_binary_tree(preorder, inorder)
+            nodes, parents, stack = {}, {root.val: None}, [root]
+            while stack:
+                node = stack.pop()
+                nodes[node.val] = node
+                for child in (node.left, node.right):
+                    if child:
+                        parents[child.val] = node
+                        stack.append(child)
+            results = []
+            for op in steps:
+                if len(op) == 1:
+                    node, parent = nodes.pop(op[0]), parents.pop(op[0])
+                    if parent.left is node:
+                        parent.left = None
+                    else:
+                        parent.right = None
+                else:
+                    parent_value, value, right = op
+                    node = nodes[value] = tree.TreeNode(value)
+                    parent = parents[value] = nodes[parent_value]
+                    if right:
+                        parent.right = node
+                    else:
+                        parent.left = node
+                height, diameter = legacy.find_height_and_diameter(root)
+                results.append((height, diameter, legacy.is_balanced(root)))
+            return results
+
+        reference, result = _timed(incremental)
+        sample = ops[:args.sample]
+        baseline, expected = _timed(recompute, sample)
+        assert result[:len(sample)] == expected
+        baseline *= len(ops) / max(len(sample), 1)
+        print(f"n={n:>9}  steps={len(ops)}  recompute extrapolated from {len(sample)} steps")
+        _report(n, baseline, reference, ("recompute", "dynamic"))
+
+
+def bench_parallel(args):
+    """Serial CompactTree metrics vs parallel_metrics at 1..cpu_count workers."""
+    counts, workers = [], 1
+    while workers < (os.cpu_count() or 1):
+        counts.append(workers)
+        workers *= 2
+    counts.append(os.cpu_count() or 1)
+    for n in args.sizes:
+        compact = CompactTree.from_traversals(*random_traversals(n, args.seed))
+
+        def serial():
+            height, diameter = compact.height_and_diameter()
+            leaves = sum(1 for l, r in zip(compact.left, compact.right) if l < 0 and r < 0)
+            return height, diameter, compact.is_balanced(), leaves
+
+        baseline, expected = _timed(serial)
+        for workers in counts:
+            reference, result = _timed(parallel_metrics, compact, workers)
+            assert result == expected
+            _report(n, baseline, reference, ("serial", f"{workers:>3} workers"))
+
+
+def bench_levelorder(args):
+    """Build from preorder + inorder vs from one level-order list (TreeNode and compact)."""
+    for n in args.sizes:
+        preorder, inorder = random_traversals(n, args.seed)
+        level_order = tree.to_level_order(construct_binary_tree(preorder, inorder))
+        print(f"n={n:>9}  traversal values={2 * n}  level-order values={len(level_order)}")
+        baseline, root = _timed(construct_binary_tree, preorder, inorder)
+        reference, loaded = _timed(tree.construct_binary_tree_from_level_order, level_order)
+        assert _same_tree(root, loaded)
+        _report(n, baseline, reference, ("traversals", "level-order"))
+        baseline, compact = _timed(CompactTree.from_traversals, preorder, inorder)
+        reference, loaded = _timed(CompactTree.from_level_order, level_order)
+        assert loaded.values == compact.values and loaded.right == compact.right
+        _report(n, baseline, reference, ("compact traversals", "compact level-order"))
+
+
+def bench_diameter(args):
+    """Diameter count only vs count plus endpoints, apex and rebuilt path."""
+    for n in args.sizes:
+        preorder, inorder = random_traversals(n, args.seed)
+        root = construct_binary_tree(preorder, inorder)
+        compact = CompactTree.from_traversals(preorder, inorder)
+        baseline, (_, diameter) = _timed(tree.find_height_and_diameter, root)
+        reference, result = _timed(tree.find_diameter_path, root)
+        assert result.diameter == diameter == len(result.path)
+        _report(n, baseline, reference, ("count", "path"))
+        baseline, _ = _timed(compact.height_and_diameter)
+        reference, compact_result = _timed(compact.diameter_path)
+        assert compact_result.path == result.path
+        _report(n, baseline, reference, ("compact count", "compact path"))
+
+
+def bench_array_search(args):
+    """Array.binary_search: selection sort on every call vs the sorted flag.
+
+    Sizes are element counts and ``--queries`` the number of searches.
+    Each legacy search is a full O(n^2) selection sort, so that side is
+    timed on at most three searches and extrapolated.
+    """
+    for n in args.sizes:
+        rng = random.Random(args.seed)
+        values = [rng.randrange(n) for _ in range(n)]
+        targets = [rng.randrange(n) for _ in range(args.queries)]
+
+        def searched():
+            arr = Array(values)
+            return [arr.binary_search(value) for value in targets]
+
+        reference, result = _timed(searched)
+        sample = targets[:min(args.sample, 3)]
+        old = legacy.Array()
+        old.data = list(values)
+        baseline, expected = _timed(lambda: [old.binary_search(value) for value in sample])
+        assert result[:len(sample)] == expected
+        baseline *= len(targets) / max(len(sample), 1)
+        print(f"n={n:>9}  searches={len(targets)}  legacy extrapolated from {len(sample)} searches")
+        _report(n, baseline, reference)
+
+
+def bench_array_storage(args):
+    """Bytes per element and sort time, list vs int64 storage."""
+    for n in args.sizes:
+        rng = random.Random(args.seed)
+        # Iterating an array('q') boxes fresh ints, so the list side is
+        # charged for its int objects as it would be when loaded.
+        values = array("q", (rng.randrange(-(2 ** 62), 2 ** 62) for _ in range(n)))
+        list_bytes, boxed = _retained_bytes(Array, values)
+        typed_bytes, typed = _retained_bytes(Array, values, "int64")
+        Array([1, 0], "int64").selection_sort()  # keep NumPy's import out of the timing
+        print(f"n={n:>9}  list={list_bytes / n:6.1f} B/elem  int64={typed_bytes / n:6.1f} B/elem")
+        baseline, _ = _timed(boxed.selection_sort)
+        reference, _ = _timed(typed.selection_sort)
+        assert list(typed.data) == boxed.data
+        _report(n, baseline, reference, ("list sort", "int64 sort"))
+
+
+def bench_array_rotate(args):
+    """CustomArray.rotate: slice-and-concatenate vs the stored offset.
+
+    ``--queries`` rotations are applied; the legacy side is timed on
+    ``--sample`` of them and extrapolated.
+    """
+    for n in args.sizes:
+        rng = random.Random(args.seed)
+        steps = [rng.randrange(1, n) for _ in range(args.queries)]
+        arr = CustomArray(range(n))
+
+        def rotated():
+            for k in steps:
+                arr.rotate(k)
+            return arr.linear_search(0)
+
+        reference, result = _timed(rotated)
+        old = legacy.CustomArray()
+        old.array = list(range(n))
+        sample = steps[:args.sample]
+        baseline, _ = _timed(lambda: [old.rotate(k) for k in sample])
+        check = CustomArray(range(n))
+        for k in sample:
+            check.rotate(k)
+        assert list(check) == old.array
+        baseline *= len(steps) / max(len(sample), 1)
+        assert result == sum(steps) % n
+        print(f"n={n:>9}  rotations={len(steps)}  legacy extrapolated from {len(sample)} rotations")
+        _report(n, baseline, reference)
+
+
+def bench_array_insert(args):
+    """Random-position CustomArray.insert: list storage vs blocked storage.
+
+    ``--queries`` inserts are applied; the list side is timed on
+    ``--sample`` of them and extrapolated. A second run grows an array
+    from empty to ``n`` elements, with the list side up to ``--legacy-max``.
+    """
+    for n in args.sizes:
+        rng = random.Random(args.seed)
+        positions = [rng.randint(0, n + i) for i in range(args.queries)]
+        blocked = CustomArray(range(n), "blocked")
+
+        def inserted(arr, batch):
+            for value, position in enumerate(batch):
+                arr.insert(position, value)
+
+        reference, _ = _timed(inserted, blocked, positions)
+        sample = positions[:args.sample]
+        plain, check = CustomArray(range(n)), CustomArray(range(n), "blocked")
+        baseline, _ = _timed(inserted, plain, sample)
+        inserted(check, sample)
+        assert list(check) == plain.array
+        baseline *= len(positions) / max(len(sample), 1)
+        print(f"n={n:>9}  inserts={len(positions)}  list extrapolated from {len(sample)} inserts")
+        _report(n, baseline, reference, ("list", "blocked"))
+
+        # Growing from empty, as the exercises do, exercises re-chunking.
+        grow = [rng.randint(0, k) for k in range(n)]
+        blocked = CustomArray(storage="blocked")
+        reference, _ = _timed(inserted, blocked, grow)
+        baseline = None
+        if n <= args.legacy_max:
+            plain = CustomArray()
+            baseline, _ = _timed(inserted, plain, grow)
+            assert list(blocked) == plain.array
+        print(f"n={n:>9}  {n} inserts into an initially empty array")
+        _report(n, baseline, reference, ("list", "blocked"))
+
+
+def bench_array_index(args):
+    """CustomArray.linear_search: scanning vs the lazily built value index.
+
+    ``--queries`` lookups, half of them misses; the scanning side is timed
+    on ``--sample`` of them and extrapolated. The index build is included
+    in the indexed time. A second run alternates ``--sample`` middle
+    inserts with searches, which keep invalidating the index.
+    """
+    for n in args.sizes:
+        rng = random.Random(args.seed)
+        values = [rng.randrange(n) for _ in range(n)]
+        targets = [rng.randrange(2 * n) for _ in range(args.queries)]
+        indexed = CustomArray(values, indexed=True)
+        reference, result = _timed(lambda: [indexed.linear_search(value) for value in targets])
+        scanning = CustomArray(values)
+        sample = targets[:args.sample]
+        baseline, expected = _timed(lambda: [scanning.linear_search(value) for value in sample])
+        assert result[:len(sample)] == expected
+        baseline *= len(targets) / max(len(sample), 1)
+        print(f"n={n:>9}  searches={len(targets)}  scan extrapolated from {len(sample)} searches")
+        _report(n, baseline, reference, ("scan", "indexed"))
+
+        # Alternating middle inserts and searches drop the index every
+        # time; the indexed array should keep scanning rather than rebuild.
+        def mixed(arr):
+            found = []
+            for value in sample:
+                arr.insert(len(arr) // 2, value)
+                found.append(arr.linear_search(value))
+            return found
+
+        baseline, expected = _timed(mixed, CustomArray(values))
+        reference, result = _timed(mixed, CustomArray(values, indexed=True))
+        assert result == expected
+        print(f"n={n:>9}  {len(sample)} middle inserts, each followed by a search")
+        _report(n, baseline, reference, ("scan", "indexed"))
+
+
+def bench_array_batch(args):
+    """Single CustomArray calls vs search_many, insert_many and delete_many.
+
+    ``--queries`` operations of each kind; the single calls are timed on
+    ``--sample`` of them and extrapolated.
+    """
+    for n in args.sizes:
+        rng = random.Random(args.seed)
+        values = [rng.randrange(n) for _ in range(n)]
+        targets = [rng.randrange(2 * n) for _ in range(args.queries)]
+        for label, storage in (("unsorted", "list"), ("sorted", "int64")):
+            arr = CustomArray(values, storage)
+            if label == "sorted":
+                arr.selection_sort()
+            sample = targets[:args.sample]
+            baseline, expected = _timed(lambda: [arr.linear_search(value) for value in sample])
+            reference, result = _timed(arr.search_many, targets)
+            assert result[:len(sample)] == expected
+            baseline *= len(targets) / len(sample)
+            _report(n, baseline, reference, (f"{label} single", "search_many"))
+
+        positions = [rng.randint(0, n + k) for k in range(args.queries)]
+        sample = positions[:args.sample]
+        single, batch = CustomArray(values), CustomArray(values)
+        baseline, _ = _timed(lambda: [single.insert(p, k) for k, p in enumerate(sample)])
+        check = CustomArray(values)
+        check.insert_many(sample, range(len(sample)))
+        assert check.array == single.array
+        baseline *= len(positions) / len(sample)
+        reference, _ = _timed(batch.insert_many, positions, range(len(positions)))
+        _report(n, baseline, reference, ("insert", "insert_many"))
+
+        total = len(batch)
+        positions = [rng.randrange(total - k) for k in range(min(args.queries, total))]
+        sample = positions[:args.sample]
+        single = CustomArray(batch.array)
+        baseline, _ = _timed(lambda: [single.delete(p) for p in sample])
+        check = CustomArray(batch.array)
+        check.delete_many(sample)
+        assert check.array == single.array
+        baseline *= len(positions) / len(sample)
+        reference, _ = _timed(batch.delete_many, positions)
+        _report(n, baseline, reference, ("delete", "delete_many"))
+
+
+BENCHMARKS = {
+    "array-batch": bench_array_batch,
+    "array-index": bench_array_index,
+    "array-insert": bench_array_insert,
+    "array-rotate": bench_array_rotate,
+    "array-storage": bench_array_storage,
+    "array-search": bench_array_search,
+    "diameter": bench_diameter,
+    "levelorder": bench_levelorder,
+    "parallel": bench_parallel,
+    "dynamic": bench_dynamic,
+    "lazy": bench_lazy,
+    "casefile": bench_casefile,
+    "memo": bench_memo,
+    "vectorized": bench_vectorized,
+    "spiral": bench_spiral,
+    "paths": bench_paths,
+    "lca": bench_lca,
+    "analyze": bench_analyze,
+    "compact": bench_compact,
+    "build": bench_build,
+    "traverse": bench_traverse,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m reference.bench", description=__doc__.splitlines()[0])
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--sizes", type=_sizes, default=_sizes(DEFAULT_SIZES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--legacy-max", type=int, default=100000,
+        help="skip the legacy baseline above this size (it is quadratic)",
+    )
+    parser.add_argument("--queries", type=int, default=100000, help="query count for query benchmarks")
+    parser.add_argument("--sample", type=int, default=100, help="queries actually timed on the legacy side")
+    args = parser.parse_args(argv)
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""Binary on-disk format for tree test cases, loaded through ``mmap``.
+
+Generated test files carry their inputs as Python list literals that are
+re-parsed on every run. A case file stores many cases as flat native
+int64 words instead, and :class:`CaseFile` maps it read-only and exposes
+each block as a ``memoryview``, so nothing is parsed and no intermediate
+list is built before a tree is constructed.
+
+Layout, all int64 in native byte order::
+
+    header   b"TREECASE"  version  case_count
+    case     n  q  flags
+             preorder[n]  inorder[n]  queries[2q]     (p0, q0, p1, q1, ...)
+             if flags & HAS_EXPECTED:
+                 height  diameter  is_balanced  path_count  lca[q]
+             if flags & HAS_SPIRAL:
+                 levels  offsets[levels + 1]  spiral[n]
+
+A missing LCA is stored as :data:`NO_LCA` and read back as ``None``. The
+spiral block is the :class:`~reference.spiral.SpiralOrder` CSR layout; it
+was added in version 2, which reads version 1 files unchanged.
+Fixed-width words were chosen over varints so every block can be viewed
+in place without decoding.
+"""
+
+import mmap
+import struct
+from array import array
+from typing import NamedTuple, Optional, Sequence
+
+from .compact import CompactTree
+from .spiral import SpiralOrder
+from .tree import construct_binary_tree
+
+MAGIC = b"TREECASE"
+VERSION = 2
+HAS_EXPECTED = 1
+HAS_SPIRAL = 2
+NO_LCA = -(2 ** 63)
+
+_HEADER = struct.Struct("=8sqq")
+
+
+class CaseExpected(NamedTuple):
+    """Expected results of a case; ``lca`` has one entry per query."""
+
+    height: int
+    diameter: int
+    is_balanced: bool
+    path_count: int
+    lca: Sequence[Optional[int]]
+    spiral: Optional[SpiralOrder] = None
+
+
+class TreeCase(NamedTuple):
+    """One test case.
+
+    Blocks read from a :class:`CaseFile` are int64 memoryviews, except
+    ``expected.lca``, which is a list so that missing answers can be ``None``.
+    """
+
+    preorder: Sequence[int]
+    inorder: Sequence[int]
+    queries: Sequence[int]
+    expected: Optional[CaseExpected] = None
+
+    def pairs(self):
+        """Return the ``(p, q)`` query pairs."""
+        return list(zip(self.queries[::2], self.queries[1::2]))
+
+    def tree(self):
+        """Build the case's tree as ``TreeNode`` objects."""
+        return construct_binary_tree(self.preorder, self.inorder)
+
+    def compact(self):
+        """Build the case's tree as a :class:`CompactTree`."""
+        return CompactTree.from_traversals(self.preorder, self.inorder)
+
+
+class CaseWriter:
+    """Stream cases into a case file; the count is patched in on close.
+
+    Usable as a context manager. Queries may be given flat or as pairs,
+    any two-item sequence counting as a pair.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, 0))
+        self.count = 0
+
+    def write(self, case):
+        preorder, inorder, queries, expected = TreeCase(*case)
+        if len(preorder) != len(inorder):
+            raise ValueError("preorder and inorder lengths differ")
+        flat = array("q")
+        for item in queries:
+            try:
+                flat.append(item)
+            except TypeError:
+                try:
+                    p, q = item
+                except (TypeError, ValueError):
+                    raise ValueError("queries must hold (p, q) pairs") from None
+                flat.append(p)
+                flat.append(q)
+        if len(flat) % 2:
+            raise ValueError("queries must hold (p, q) pairs")
+
+        flags = 0
+        if expected is not None:
+            if len(expected.lca) != len(flat) // 2:
+                raise ValueError("expected.lca needs one entry per query")
+            flags |= HAS_EXPECTED
+            if expected.spiral is not None:
+                if len(expected.spiral.values) != len(preorder):
+                    raise ValueError("expected.spiral must hold every value once")
+                flags |= HAS_SPIRAL
+
+        # The record is assembled in full before anything is written, so a
+        # case that fails part-way leaves no partial record in the file.
+        record = array("q", (len(preorder), len(flat) // 2, flags))
+        record.extend(preorder)
+        record.extend(inorder)
+        record.extend(flat)
+        if expected is not None:
+            record.extend((
+                expected.height, expected.diameter,
+                int(expected.is_balanced), expected.path_count,
+            ))
+            record.extend(NO_LCA if v is None else v for v in expected.lca)
+        if flags & HAS_SPIRAL:
+            spiral = expected.spiral
+            record.append(len(spiral))
+            record.extend(spiral.offsets)
+            record.extend(spiral.values)
+        self._file.write(record.tobytes())
+        self.count += 1
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, VERSION, self.count))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_cases(path, cases):
+    """Write an iterable of cases to ``path``; return how many were written."""
+    with CaseWriter(path) as writer:
+        for case in cases:
+            writer.write(case)
+    return writer.count
+
+
+class CaseFile:
+    """Read-only, memory-mapped view of a case file.
+
+    Opening only walks the per-case headers to find offsets. Cases hold
+    views into the mapping, so drop them before calling :meth:`close`.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._words = None
+        try:
+            self._offsets = self._scan(path)
+        except BaseException:
+            # No case views exist yet, so the mapping can always be closed.
+            self.close()
+            raise
+
+    def _scan(self, path):
+        """Check the header and return each case's word offset."""
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"{path} is not a tree case file")
+        magic, version, count = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a tree case file")
+        if not 1 <= version <= VERSION:
+            raise ValueError(f"{path}: unsupported case file version {version}")
+        if len(self._mmap) % 8:
+            raise ValueError(f"{path}: truncated or trailing data")
+
+        self._words = memoryview(self._mmap).cast("q")
+        words, offsets, pos = self._words, [], _HEADER.size // 8
+        try:
+            for _ in range(count):
+                offsets.append(pos)
+                n, q, flags = words[pos], words[pos + 1], words[pos + 2]
+                pos += 3 + 2 * n + 2 * q
+                if flags & HAS_EXPECTED:
+                    pos += 4 + q
+                if flags & HAS_SPIRAL:
+                    pos += 2 + words[pos] + n
+        except IndexError:
+            pos = -1
+        if pos != len(words):
+            raise ValueError(f"{path}: truncated or trailing data")
+        return offsets
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        words = self._words
+        pos = self._offsets[index]
+        n, q, flags = words[pos], words[pos + 1], words[pos + 2]
+        pos += 3
+        preorder = words[pos:pos + n]
+        inorder = words[pos + n:pos + 2 * n]
+        pos += 2 * n
+        queries = words[pos:pos + 2 * q]
+        pos += 2 * q
+        expected = None
+        if flags & HAS_EXPECTED:
+            height, diameter, balanced, path_count = words[pos:pos + 4]
+            lca = [None if v == NO_LCA else v for v in words[pos + 4:pos + 4 + q]]
+            pos += 4 + q
+            spiral = None
+            if flags & HAS_SPIRAL:
+                levels = words[pos]
+                offsets = words[pos + 1:pos + 2 + levels]
+                pos += 2 + levels
+                spiral = SpiralOrder(words[pos:pos + n], offsets)
+            expected = CaseExpected(height, diameter, bool(balanced), path_count, lca, spiral)
+        return TreeCase(preorder, inorder, queries, expected)
+
+    def __iter__(self):
+        for index in range(len(self._offsets)):
+            yield self[index]
+
+    def close(self):
+        if self._words is not None:
+            self._words.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,288 @@
+"""Array-backed binary trees for reference runs on large inputs.
+
+A :class:`CompactTree` stores node ``i`` as ``values[i]``, ``left[i]`` and
+``right[i]`` in three parallel ``array('q')`` buffers, with ``-1`` for a
+missing child. That is 24 bytes per node instead of a ``TreeNode``
+instance and its ``__dict__``.
+
+Nodes are always laid out in preorder: the root is index 0 and every
+child has a larger index than its parent. The metrics below rely on
+that, so a reverse scan over the indices is a valid post-order and a
+forward scan is a valid preorder; none of them need a stack.
+"""
+
+from array import array
+
+from .spiral import SpiralOrder
+from .tree import DiameterPath, TreeNode, _inorder_index
+from .validation import _missing_error, _order_error, validate_traversals
+
+
+class CompactTree:
+    """Binary tree stored as parallel ``values`` / ``left`` / ``right`` arrays."""
+
+    __slots__ = ("values", "left", "right")
+
+    def __init__(self, values, left, right):
+        self.values = values
+        self.left = left
+        self.right = right
+
+    def __len__(self):
+        return len(self.values)
+
+    @classmethod
+    def from_traversals(cls, preorder, inorder, validate=False):
+        """Build from preorder and inorder traversals in O(n).
+
+        Since nodes are laid out in preorder, node ``i`` holds
+        ``preorder[i]``, its left child (if any) is ``i + 1`` and its right
+        child comes right after the left subtree. Only the child links
+        need computing, from the inorder position of each value.
+        ``validate`` and repeated values are handled as in
+        ``construct_binary_tree``; traversals that fit no tree raise
+        ``TraversalError`` either way.
+        """
+        if validate:
+            validate_traversals(preorder, inorder)
+        n = len(preorder)
+        values = array("q", preorder)
+        left = array("q", [-1]) * n
+        right = array("q", [-1]) * n
+        if not n:
+            return cls(values, left, right)
+
+        index, repeats = _inorder_index(inorder)
+        stack = [(0, 0, n - 1)]
+        # Without validation a value missing from inorder fails the lookup.
+        try:
+            while stack:
+                i, lo, hi = stack.pop()
+                mid = index[values[i]]
+                if not lo <= mid <= hi:
+                    mid = repeats.first_in_range(values[i], lo, hi) if repeats else -1
+                    if mid < 0:
+                        raise _order_error(i, values[i], repeats is not None)
+                # The left frame goes on last so nodes are visited in preorder,
+                # which the repeated-value cursors rely on.
+                if mid < hi:
+                    j = i + 1 + mid - lo
+                    right[i] = j
+                    stack.append((j, mid + 1, hi))
+                if mid > lo:
+                    left[i] = i + 1
+                    stack.append((i + 1, lo, mid - 1))
+        except KeyError:
+            raise _missing_error(i, values[i]) from None
+        return cls(values, left, right)
+
+    @classmethod
+    def from_node(cls, root):
+        """Convert a ``TreeNode`` tree."""
+        values, left, right = array("q"), array("q"), array("q")
+        stack = [(root, -1, False)] if root else []
+        while stack:
+            node, parent, is_right = stack.pop()
+            i = len(values)
+            values.append(node.val)
+            left.append(-1)
+            right.append(-1)
+            if parent >= 0:
+                if is_right:
+                    right[parent] = i
+                else:
+                    left[parent] = i
+            if node.right:
+                stack.append((node.right, i, True))
+            if node.left:
+                stack.append((node.left, i, False))
+        return cls(values, left, right)
+
+    @classmethod
+    def from_level_order(cls, level_order):
+        """Build from a LeetCode-style level-order list in O(n).
+
+        Accepts the same input as ``construct_binary_tree_from_level_order``.
+        The list is read once into breadth-first child links, which one
+        stack walk then relabels into the preorder layout.
+        """
+        n = len(level_order)
+        if not n or level_order[0] is None:
+            if any(val is not None for val in level_order):
+                raise ValueError("level-order list has values below a missing root")
+            return cls(array("q"), array("q"), array("q"))
+        bfs_values, bfs_left, bfs_right = [level_order[0]], [], []
+        i = 1
+        while len(bfs_left) < len(bfs_values) and i < n:
+            for links, j in ((bfs_left, i), (bfs_right, i + 1)):
+                if j < n and level_order[j] is not None:
+                    links.append(len(bfs_values))
+                    bfs_values.append(level_order[j])
+                else:
+                    links.append(-1)
+            i += 2
+        if i < n and any(level_order[j] is not None for j in range(i, n)):
+            raise ValueError(f"level-order value at index {i} has no parent")
+        missing = [-1] * (len(bfs_values) - len(bfs_left))
+        bfs_left += missing
+        bfs_right += missing
+
+        m = len(bfs_values)
+        values = array("q", [0]) * m
+        left = array("q", [-1]) * m
+        right = array("q", [-1]) * m
+        stack, i = [(0, -1, False)], 0
+        while stack:
+            k, parent, is_right = stack.pop()
+            values[i] = bfs_values[k]
+            if parent >= 0:
+                if is_right:
+                    right[parent] = i
+                else:
+                    left[parent] = i
+            if bfs_right[k] >= 0:
+                stack.append((bfs_right[k], i, True))
+            if bfs_left[k] >= 0:
+                stack.append((bfs_left[k], i, False))
+            i += 1
+        return cls(values, left, right)
+
+    def to_level_order(self):
+        """Return the LeetCode-style level-order list, like ``to_level_order``."""
+        tree_values, left, right = self.values, self.left, self.right
+        values, queue = [], [0] if len(tree_values) else []
+        for i in queue:
+            if i < 0:
+                values.append(None)
+                continue
+            values.append(tree_values[i])
+            queue.append(left[i])
+            queue.append(right[i])
+        while values and values[-1] is None:
+            values.pop()
+        return values
+
+    def to_node(self):
+        """Convert back to a ``TreeNode`` tree and return its root."""
+        nodes = [TreeNode(val) for val in self.values]
+        for node, l, r in zip(nodes, self.left, self.right):
+            if l >= 0:
+                node.left = nodes[l]
+            if r >= 0:
+                node.right = nodes[r]
+        return nodes[0] if nodes else None
+
+    def height_and_diameter(self):
+        """Return ``(height, diameter)`` like ``find_height_and_diameter``."""
+        n = len(self.values)
+        left, right = self.left, self.right
+        # One spare slot at the end: a missing child (-1) reads heights[n] == 0.
+        heights = array("q", [0]) * (n + 1)
+        diameter = 0
+        for i in range(n - 1, -1, -1):
+            lh = heights[left[i]]
+            rh = heights[right[i]]
+            heights[i] = 1 + (lh if lh > rh else rh)
+            if lh + rh + 1 > diameter:
+                diameter = lh + rh + 1
+        return heights[0], diameter
+
+    def diameter_path(self):
+        """Return a :class:`~reference.tree.DiameterPath` with node indices.
+
+        Same result as ``find_diameter_path``, with ``start``, ``apex``
+        and ``end`` given as indices (``-1`` for an empty tree). The
+        reverse scan keeps each subtree's deepest index next to its
+        height and records parent links as it goes.
+        """
+        n = len(self.values)
+        if not n:
+            return DiameterPath(0, 0, -1, -1, -1, [])
+        values, left, right = self.values, self.left, self.right
+        heights = array("q", [0]) * (n + 1)
+        deepest = array("q", [0]) * n
+        parent = array("q", [-1]) * n
+        diameter = start = apex = end = 0
+        for i in range(n - 1, -1, -1):
+            l, r = left[i], right[i]
+            lh, rh = heights[l], heights[r]
+            ld = deepest[l] if l >= 0 else i
+            rd = deepest[r] if r >= 0 else i
+            if l >= 0:
+                parent[l] = i
+            if r >= 0:
+                parent[r] = i
+            # >= keeps the lowest index, i.e. the first apex in preorder.
+            if lh + rh + 1 >= diameter:
+                diameter = lh + rh + 1
+                start, apex, end = ld, i, rd
+            if lh >= rh:
+                heights[i], deepest[i] = 1 + lh, ld
+            else:
+                heights[i], deepest[i] = 1 + rh, rd
+
+        path, i = [], start
+        while i != apex:
+            path.append(values[i])
+            i = parent[i]
+        path.append(values[apex])
+        tail, i = [], end
+        while i != apex:
+            tail.append(values[i])
+            i = parent[i]
+        path.extend(reversed(tail))
+        return DiameterPath(diameter, heights[0], start, apex, end, path)
+
+    def is_balanced(self):
+        """Return whether every node's subtrees differ in height by at most one."""
+        n = len(self.values)
+        left, right = self.left, self.right
+        heights = array("q", [0]) * (n + 1)
+        for i in range(n - 1, -1, -1):
+            lh = heights[left[i]]
+            rh = heights[right[i]]
+            if lh - rh > 1 or rh - lh > 1:
+                return False
+            heights[i] = 1 + (lh if lh > rh else rh)
+        return True
+
+    def spiral_order(self):
+        """Return levels in zig-zag order like ``level_order_spiral``."""
+        return SpiralOrder.from_compact(self).to_lists()
+
+    def lca(self, p, q):
+        """Return the index of the lowest common ancestor, or -1.
+
+        Same semantics as ``find_lca``: a node holding ``p`` or ``q`` is
+        returned without looking below it.
+        """
+        n = len(self.values)
+        values, left, right = self.values, self.left, self.right
+        found = array("q", [-1]) * (n + 1)
+        for i in range(n - 1, -1, -1):
+            val = values[i]
+            if val == p or val == q:
+                found[i] = i
+            else:
+                a, b = found[left[i]], found[right[i]]
+                found[i] = i if a >= 0 and b >= 0 else (a if a >= 0 else b)
+        return found[0] if n else -1
+
+    def paths(self):
+        """Return every root-to-leaf path like ``print_all_paths``."""
+        n = len(self.values)
+        values, left, right = self.values, self.left, self.right
+        depth = array("q", [0]) * n
+        paths, path = [], []
+        for i in range(n):
+            d = depth[i]
+            del path[d:]
+            path.append(values[i])
+            l, r = left[i], right[i]
+            if l < 0 and r < 0:
+                paths.append(list(path))
+            if l >= 0:
+                depth[l] = d + 1
+            if r >= 0:
+                depth[r] = d + 1
+        return paths
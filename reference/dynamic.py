@@ -0,0 +1,129 @@
+"""Tree metrics kept up to date under leaf insertions and deletions.
+
+Live exercises mutate a tree and ask for height, diameter and balance
+after every step. :class:`DynamicTree` keeps, for every node, its subtree
+height, the best diameter inside the subtree and how many unbalanced
+nodes the subtree contains. A leaf change only affects the nodes on its
+path to the root, and the walk up stops at the first ancestor whose
+record does not change, so each step is O(height) and each query O(1).
+"""
+
+from .tree import TreeNode
+
+
+class DynamicTree:
+    """``TreeNode`` tree with incrementally maintained metrics.
+
+    Nodes are addressed by value, so values must be distinct, as in the
+    rest of the tree suite. ``root`` is an ordinary ``TreeNode`` tree and
+    can be handed to any suite function, but it must only be changed
+    through :meth:`insert` and :meth:`delete`.
+    """
+
+    def __init__(self, root=None):
+        self.root = root
+        self._nodes = {}
+        # node -> [height, diameter, unbalanced count, parent]; the entry
+        # for None lets missing children be read like any other node.
+        self._info = {None: [0, 0, 0, None]}
+        stack = [(root, None, False)] if root else []
+        while stack:
+            node, parent, expanded = stack.pop()
+            if expanded:
+                self._info[node] = self._record(node) + [parent]
+                continue
+            if node.val in self._nodes:
+                raise ValueError(f"duplicate value {node.val!r}")
+            self._nodes[node.val] = node
+            stack.append((node, parent, True))
+            if node.right:
+                stack.append((node.right, node, False))
+            if node.left:
+                stack.append((node.left, node, False))
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, value):
+        return value in self._nodes
+
+    def node(self, value):
+        """Return the ``TreeNode`` holding ``value``."""
+        return self._nodes[value]
+
+    @property
+    def height(self):
+        return self._info[self.root][0]
+
+    @property
+    def diameter(self):
+        return self._info[self.root][1]
+
+    @property
+    def is_balanced(self):
+        return self._info[self.root][2] == 0
+
+    def _record(self, node):
+        lh, ld, lu, _ = self._info[node.left]
+        rh, rd, ru, _ = self._info[node.right]
+        return [
+            1 + (lh if lh > rh else rh),
+            max(lh + rh + 1, ld, rd),
+            lu + ru + (1 if lh - rh > 1 or rh - lh > 1 else 0),
+        ]
+
+    def _refresh(self, node):
+        info = self._info
+        while node is not None:
+            record = info[node]
+            updated = self._record(node)
+            if updated == record[:3]:
+                return
+            record[:3] = updated
+            node = record[3]
+
+    def insert(self, parent_value, value, right=False):
+        """Attach a new leaf ``value`` under ``parent_value`` and return it.
+
+        ``parent_value`` is ignored (and may be ``None``) when the tree is
+        empty. Raises ``ValueError`` if the value already exists or the
+        requested child slot is taken, and ``KeyError`` for an unknown
+        parent.
+        """
+        if value in self._nodes:
+            raise ValueError(f"duplicate value {value!r}")
+        node = TreeNode(value)
+        if self.root is None:
+            self.root = node
+            parent = None
+        else:
+            parent = self._nodes[parent_value]
+            if (parent.right if right else parent.left) is not None:
+                raise ValueError(f"{parent_value!r} already has a {'right' if right else 'left'} child")
+            if right:
+                parent.right = node
+            else:
+                parent.left = node
+        self._nodes[value] = node
+        self._info[node] = [1, 1, 0, parent]
+        self._refresh(parent)
+        return node
+
+    def delete(self, value):
+        """Remove the leaf holding ``value``.
+
+        Raises ``ValueError`` if that node still has children and
+        ``KeyError`` for an unknown value.
+        """
+        node = self._nodes[value]
+        if node.left or node.right:
+            raise ValueError(f"{value!r} is not a leaf")
+        parent = self._info.pop(node)[3]
+        del self._nodes[value]
+        if parent is None:
+            self.root = None
+        elif parent.left is node:
+            parent.left = None
+        else:
+            parent.right = None
+        self._refresh(parent)
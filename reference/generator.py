@@ -0,0 +1,204 @@
+"""Seeded stress-case generator with reference answers.
+
+The hand-written tree tests use two or three trees of a handful of nodes.
+:func:`generate_case` builds a tree of any size and shape from a seed and
+attaches the expected height, diameter, spiral order, balance, path count
+and LCA answers. :func:`write_stress_cases` streams cases straight into a
+case file (see :mod:`reference.casefile`), so only one tree is in memory
+at a time and 10^6-node cases can be produced.
+
+A shape is a rule for picking each subtree's root among its inorder
+positions ``lo..hi``. Building on positions rather than nodes yields the
+preorder directly, and values are a seeded shuffle of ``0..n-1``. Each
+case draws from its own ``random.Random`` seeded with the seed, shape and
+size, so a case does not depend on what was generated before it.
+"""
+
+import argparse
+import random
+from array import array
+
+from .casefile import CaseExpected, TreeCase, write_cases
+from .compact import CompactTree
+from .spiral import SpiralOrder
+
+SHAPES = ("balanced", "random", "left_skewed", "right_skewed", "zigzag", "complete")
+
+
+def _complete_left_size(size):
+    """Left subtree size of a complete tree with ``size`` nodes."""
+    levels = size.bit_length() - 1
+    if not levels:
+        return 0
+    half = 1 << (levels - 1)
+    return half - 1 + min(size - ((1 << levels) - 1), half)
+
+
+def _root_position(shape, rng, lo, hi, depth):
+    if shape == "balanced":
+        return (lo + hi) // 2
+    if shape == "random":
+        return rng.randint(lo, hi)
+    if shape == "left_skewed":
+        return hi
+    if shape == "right_skewed":
+        return lo
+    if shape == "zigzag":
+        return hi if depth % 2 == 0 else lo
+    return lo + _complete_left_size(hi - lo + 1)
+
+
+def _rng(shape, n, seed):
+    return random.Random(f"{seed}:{shape}:{n}")
+
+
+def generate_traversals(shape, n, seed=0, rng=None):
+    """Return ``(preorder, inorder)`` ``array('q')`` buffers for one tree.
+
+    ``shape`` is one of :data:`SHAPES`. ``rng`` overrides the per-case
+    generator derived from ``seed``.
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"unknown shape {shape!r}; expected one of {', '.join(SHAPES)}")
+    rng = rng or _rng(shape, n, seed)
+    inorder = list(range(n))
+    rng.shuffle(inorder)
+    inorder = array("q", inorder)
+    preorder = array("q")
+    stack = [(0, n - 1, 0)] if n else []
+    while stack:
+        lo, hi, depth = stack.pop()
+        mid = _root_position(shape, rng, lo, hi, depth)
+        preorder.append(inorder[mid])
+        if mid < hi:
+            stack.append((mid + 1, hi, depth + 1))
+        if mid > lo:
+            stack.append((lo, mid - 1, depth + 1))
+    return preorder, inorder
+
+
+def random_traversals(n, seed=0):
+    """Return ``(preorder, inorder)`` lists for a random tree of ``n`` distinct values.
+
+    The ``"random"`` shape, drawn from ``random.Random(seed)`` alone so the
+    benchmarks and tests see the same tree for a seed at every size.
+    """
+    rng = random.Random(seed)
+    inorder = list(range(n))
+    rng.shuffle(inorder)
+    preorder = []
+    stack = [(0, n - 1)] if n else []
+    while stack:
+        lo, hi = stack.pop()
+        mid = rng.randint(lo, hi)
+        preorder.append(inorder[mid])
+        if mid < hi:
+            stack.append((mid + 1, hi))
+        if mid > lo:
+            stack.append((lo, mid - 1))
+    return preorder, inorder
+
+
+def _lca_indices(tree, pairs):
+    """Answer ``(a, b)`` node-index pairs with Tarjan's offline LCA.
+
+    A reverse index scan over a :class:`CompactTree` finishes every node
+    after its whole subtree, exactly like a right-to-left DFS, so the
+    usual union-find sweep runs over the arrays without a stack.
+    """
+    n = len(tree)
+    left, right = tree.left, tree.right
+    up = array("q", [-1]) * n
+    for i in range(n):
+        if left[i] >= 0:
+            up[left[i]] = i
+        if right[i] >= 0:
+            up[right[i]] = i
+    waiting = {}
+    for k, (a, b) in enumerate(pairs):
+        waiting.setdefault(a, []).append((k, b))
+        waiting.setdefault(b, []).append((k, a))
+
+    # Union-find over node indices. A set's root is always its highest,
+    # still unfinished node, which is the LCA for any query answered
+    # against it, so no separate ancestor table is needed.
+    parent = array("q", range(n))
+    finished = bytearray(n)
+    answers = [-1] * len(pairs)
+
+    for i in range(n - 1, -1, -1):
+        finished[i] = 1
+        for k, other in waiting.get(i, ()):
+            if finished[other] and answers[k] < 0:
+                top = other
+                while parent[top] != top:
+                    top = parent[top]
+                while parent[other] != top:
+                    parent[other], other = top, parent[other]
+                answers[k] = top
+        if up[i] >= 0:
+            parent[i] = up[i]
+    return answers
+
+
+def expected_results(tree, pairs=()):
+    """Return the :class:`~reference.casefile.CaseExpected` for a :class:`CompactTree`.
+
+    ``pairs`` are node-index pairs; the ``lca`` answers are values.
+    """
+    height, diameter = tree.height_and_diameter()
+    left, right = tree.left, tree.right
+    leaves = sum(1 for l, r in zip(left, right) if l < 0 and r < 0)
+    values = tree.values
+    lca = [values[i] for i in _lca_indices(tree, pairs)]
+    return CaseExpected(
+        height, diameter, tree.is_balanced(), leaves, lca, SpiralOrder.from_compact(tree),
+    )
+
+
+def generate_case(shape, n, seed=0, queries=100):
+    """Return a :class:`~reference.casefile.TreeCase` with expected results.
+
+    ``queries`` random pairs of values present in the tree are attached.
+    """
+    rng = _rng(shape, n, seed)
+    preorder, inorder = generate_traversals(shape, n, rng=rng)
+    tree = CompactTree.from_traversals(preorder, inorder)
+    pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(queries)] if n else []
+    flat = array("q")
+    for a, b in pairs:
+        flat.append(preorder[a])
+        flat.append(preorder[b])
+    return TreeCase(preorder, inorder, flat, expected_results(tree, pairs))
+
+
+def generate_cases(shapes=SHAPES, sizes=(1000,), seed=0, queries=100):
+    """Yield one case per ``(shape, size)`` combination, one at a time."""
+    for n in sizes:
+        for shape in shapes:
+            yield generate_case(shape, n, seed, queries)
+
+
+def write_stress_cases(path, shapes=SHAPES, sizes=(1000,), seed=0, queries=100):
+    """Stream generated cases into a case file; return how many were written."""
+    return write_cases(path, generate_cases(shapes, sizes, seed, queries))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m reference.generator", description=__doc__.splitlines()[0],
+    )
+    parser.add_argument("path", help="case file to write")
+    parser.add_argument("--shapes", default=",".join(SHAPES))
+    parser.add_argument("--sizes", default="1000,100000")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--queries", type=int, default=100, help="LCA queries per case")
+    args = parser.parse_args(argv)
+    shapes = [shape for shape in args.shapes.split(",") if shape]
+    sizes = [int(float(part)) for part in args.sizes.split(",") if part]
+    count = write_stress_cases(args.path, shapes, sizes, args.seed, args.queries)
+    print(f"wrote {count} cases to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Trees that materialize nodes from their traversals only when touched.
+
+A :class:`LazyNode` is described by where its subtree sits in the two
+traversals: its position in preorder and its inclusive inorder range.
+``node.left`` and ``node.right`` build the child nodes from those bounds
+the first time they are read. Any function in the suite that only uses
+``val``, ``left`` and ``right`` runs on a lazy tree unchanged. A query
+that looks at part of the tree allocates only that part, and
+:attr:`LazyTree.materialized` reports how many nodes it took.
+"""
+
+from ._compat import find
+
+_UNRESOLVED = object()
+
+
+class LazyTree:
+    """Lazy view of the tree given by ``preorder`` and ``inorder``.
+
+    A node's inorder position is first found by scanning its own inorder
+    range, which is cheap for the few shallow nodes a partial query
+    touches. Once the scans add up to ``8 * n`` elements, roughly what
+    building the map costs, an O(n) value-to-index map replaces them, so
+    full materialization stays linear. The traversals are not copied and
+    must not change while the tree is in use.
+    """
+
+    def __init__(self, preorder, inorder):
+        if len(preorder) != len(inorder):
+            raise ValueError("preorder and inorder lengths differ")
+        self.preorder = preorder
+        self.inorder = inorder
+        self.materialized = 0
+        self._index = None
+        # Sequences without a bounded .index() (e.g. memoryviews) go
+        # straight to the map.
+        self._scan_budget = 8 * len(inorder) if hasattr(inorder, "index") else 0
+        self._root = _UNRESOLVED
+
+    @property
+    def root(self):
+        if self._root is _UNRESOLVED:
+            n = len(self.preorder)
+            self._root = LazyNode(self, 0, 0, n - 1) if n else None
+        return self._root
+
+    def inorder_index(self, value, lo=0, hi=None):
+        """Return the inorder position of ``value``, known to lie in ``[lo, hi]``."""
+        if self._index is None:
+            if hi is None:
+                hi = len(self.inorder) - 1
+            if hi - lo < self._scan_budget:
+                self._scan_budget -= hi - lo + 1
+                try:
+                    return find(self.inorder, value, lo, hi + 1)
+                except ValueError:
+                    raise KeyError(value) from None
+            self._index = {val: i for i, val in enumerate(self.inorder)}
+        return self._index[value]
+
+    def lca(self, p, q):
+        """Return the LCA node of ``p`` and ``q``, materializing only its root path.
+
+        Descends from the root toward whichever side holds both values'
+        inorder positions, and stops at the first node between them.
+        Raises ``ValueError`` if either value is absent.
+        """
+        try:
+            a, b = self.inorder_index(p), self.inorder_index(q)
+        except KeyError as exc:
+            raise ValueError(f"value {exc.args[0]!r} is not in the tree") from None
+        if a > b:
+            a, b = b, a
+        node = self.root
+        while True:
+            mid = node._mid()
+            if b < mid:
+                node = node.left
+            elif a > mid:
+                node = node.right
+            else:
+                return node
+
+    def spiral_order(self, max_levels=None):
+        """Return the first ``max_levels`` levels in zig-zag order (all if ``None``).
+
+        Children below the last requested level are never materialized.
+        """
+        result, level, left_to_right = [], [self.root] if self.root else [], True
+        while level and (max_levels is None or len(result) < max_levels):
+            vals = [node.val for node in level]
+            if not left_to_right:
+                vals.reverse()
+            result.append(vals)
+            if max_levels is not None and len(result) == max_levels:
+                break
+            next_level = []
+            for node in level:
+                if node.left:
+                    next_level.append(node.left)
+                if node.right:
+                    next_level.append(node.right)
+            level, left_to_right = next_level, not left_to_right
+        return result
+
+
+class LazyNode:
+    """Drop-in for ``TreeNode`` whose children are built on first access."""
+
+    __slots__ = (
+        "val", "_tree", "_pre", "_lo", "_hi", "_mid_index", "_left", "_right", "__weakref__",
+    )
+
+    def __init__(self, tree, pre, lo, hi):
+        tree.materialized += 1
+        self.val = tree.preorder[pre]
+        self._tree = tree
+        self._pre = pre
+        self._lo = lo
+        self._hi = hi
+        self._mid_index = -1
+        self._left = _UNRESOLVED
+        self._right = _UNRESOLVED
+
+    def _mid(self):
+        if self._mid_index < 0:
+            self._mid_index = self._tree.inorder_index(self.val, self._lo, self._hi)
+        return self._mid_index
+
+    @property
+    def left(self):
+        if self._left is _UNRESOLVED:
+            mid = self._mid()
+            self._left = LazyNode(self._tree, self._pre + 1, self._lo, mid - 1) if mid > self._lo else None
+        return self._left
+
+    @property
+    def right(self):
+        if self._right is _UNRESOLVED:
+            mid = self._mid()
+            if mid < self._hi:
+                self._right = LazyNode(self._tree, self._pre + 1 + mid - self._lo, mid + 1, self._hi)
+            else:
+                self._right = None
+        return self._right
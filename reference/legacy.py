@@ -0,0 +1,232 @@
+"""Verbatim copies of the student-facing tree and array suites, used as benchmark baselines.
+
+These are the implementations found in the generated ``temp/test_*.py``
+files. They are kept unchanged on purpose so benchmarks compare against
+what the runner actually executes today.
+"""
+
+from .tree import TreeNode
+
+
+def construct_binary_tree(preorder, inorder):
+    if not preorder or not inorder:
+        return None
+
+    root_val = preorder.pop(0)
+    root = TreeNode(root_val)
+    inorder_index = inorder.index(root_val)
+
+    root.left = construct_binary_tree(preorder, inorder[:inorder_index])
+    root.right = construct_binary_tree(preorder, inorder[inorder_index + 1:])
+    return root
+
+
+def find_height_and_diameter(root):
+    def dfs(node):
+        if not node:
+            return 0, 0
+
+        left_height, left_diameter = dfs(node.left)
+        right_height, right_diameter = dfs(node.right)
+
+        height = 1 + max(left_height, right_height)
+        diameter = max(left_height + right_height + 1, left_diameter, right_diameter)
+        return height, diameter
+
+    return dfs(root)
+
+
+def level_order_spiral(root):
+    if not root:
+        return []
+
+    from collections import deque
+
+    result, queue, left_to_right = [], deque([root]), True
+    while queue:
+        level_size = len(queue)
+        level = deque()
+        for _ in range(level_size):
+            node = queue.popleft()
+            if left_to_right:
+                level.append(node.val)
+            else:
+                level.appendleft(node.val)
+
+            if node.left:
+                queue.append(node.left)
+            if node.right:
+                queue.append(node.right)
+
+        result.append(list(level))
+        left_to_right = not left_to_right
+    return result
+
+
+def is_balanced(root):
+    def check(node):
+        if not node:
+            return 0, True
+
+        left_height, left_balanced = check(node.left)
+        right_height, right_balanced = check(node.right)
+
+        balanced = left_balanced and right_balanced and abs(left_height - right_height) <= 1
+        return 1 + max(left_height, right_height), balanced
+
+    _, balanced = check(root)
+    return balanced
+
+
+def find_lca(root, p, q):
+    if not root or root.val == p or root.val == q:
+        return root
+
+    left = find_lca(root.left, p, q)
+    right = find_lca(root.right, p, q)
+
+    if left and right:
+        return root
+    return left or right
+
+
+def print_all_paths(root):
+    def dfs(node, path, paths):
+        if not node:
+            return
+
+        path.append(node.val)
+        if not node.left and not node.right:
+            paths.append(list(path))
+        else:
+            dfs(node.left, path, paths)
+            dfs(node.right, path, paths)
+        path.pop()
+
+    paths = []
+    dfs(root, [], paths)
+    return paths
+
+
+class Array:
+    def __init__(self):
+        self.data = []
+
+    def insert(self, position, value):
+        """Insert a value at the specified position."""
+        self.data.insert(position, value)
+
+    def delete(self, position):
+        """Delete the value at the specified position."""
+        if 0 <= position < len(self.data):
+            self.data.pop(position)
+
+    def linear_search(self, value):
+        """Search for a value using linear search."""
+        for index, elem in enumerate(self.data):
+            if elem == value:
+                return index
+        return -1
+
+    def binary_search(self, value):
+        """Search for a value using binary search. Array is sorted before searching."""
+        self.selection_sort()  # Ensure the array is sorted
+        left, right = 0, len(self.data) - 1
+        while left <= right:
+            mid = left + (right - left) // 2
+            if self.data[mid] == value:
+                return mid
+            elif self.data[mid] < value:
+                left = mid + 1
+            else:
+                right = mid - 1
+        return -1
+
+    def bubble_sort(self):
+        """Sort the array using bubble sort."""
+        n = len(self.data)
+        for i in range(n):
+            for j in range(0, n - i - 1):
+                if self.data[j] > self.data[j + 1]:
+                    self.data[j], self.data[j + 1] = self.data[j + 1], self.data[j]
+
+    def selection_sort(self):
+        """Sort the array using selection sort."""
+        n = len(self.data)
+        for i in range(n):
+            min_idx = i
+            for j in range(i + 1, n):
+                if self.data[j] < self.data[min_idx]:
+                    min_idx = j
+            self.data[i], self.data[min_idx] = self.data[min_idx], self.data[i]
+
+    def rotate(self, k):
+        """Rotate the array by k positions."""
+        if len(self.data) == 0:
+            return
+        k = k % len(self.data)
+        self.data = self.data[-k:] + self.data[:-k]
+
+
+class CustomArray:
+    def __init__(self):
+        self.array = []
+
+    def insert(self, position, value):
+        """Inserts an element at a given position."""
+        if position < 0 or position > len(self.array):
+            raise IndexError("Position out of bounds")
+        self.array.insert(position, value)
+
+    def delete(self, position):
+        """Deletes an element at a specific position."""
+        if position < 0 or position >= len(self.array):
+            raise IndexError("Position out of bounds")
+        self.array.pop(position)
+
+    def linear_search(self, value):
+        """Searches for an element using linear search."""
+        for index, element in enumerate(self.array):
+            if element == value:
+                return index
+        return -1
+
+    def binary_search(self, value):
+        """Searches for an element using binary search. Assumes the array is sorted."""
+        low, high = 0, len(self.array) - 1
+        while low <= high:
+            mid = (low + high) // 2
+            if self.array[mid] == value:
+                return mid
+            elif self.array[mid] < value:
+                low = mid + 1
+            else:
+                high = mid - 1
+        return -1
+
+    def bubble_sort(self):
+        """Sorts the array using bubble sort."""
+        n = len(self.array)
+        for i in range(n):
+            for j in range(0, n - i - 1):
+                if self.array[j] > self.array[j + 1]:
+                    self.array[j], self.array[j + 1] = self.array[j + 1], self.array[j]
+        return self.array
+
+    def selection_sort(self):
+        """Sorts the array using selection sort."""
+        n = len(self.array)
+        for i in range(n):
+            min_index = i
+            for j in range(i + 1, n):
+                if self.array[j] < self.array[min_index]:
+                    min_index = j
+            self.array[i], self.array[min_index] = self.array[min_index], self.array[i]
+        return self.array
+
+    def rotate(self, k):
+        """Rotates the array by k positions."""
+        n = len(self.array)
+        k %= n  # Handle cases where k > n
+        self.array = self.array[-k:] + self.array[:-k]
+        return self.array
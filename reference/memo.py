@@ -0,0 +1,205 @@
+"""Structural hashing and memoized metrics for repeated subtrees.
+
+The same trees come back in submission after submission. Every subtree
+gets a Merkle-style key, the hash of ``(value, left key, right key)``, so
+structurally identical subtrees get the same key in any tree. For int
+values the key is the same in every process too, but ``hash()`` of
+``str`` and ``bytes`` is salted per process by ``PYTHONHASHSEED``, so
+keys of such trees only hold within one process and must not be stored.
+:class:`SubtreeMemo` maps those keys to ``(height, diameter, balanced)``
+in a bounded LRU and counts hits and misses. A key is a 64-bit hash, not
+a proof of identity: each entry also records the subtree's size, and a
+probe with another size is a miss, so only two same-size subtrees whose
+keys collide could share an entry.
+
+A key is built bottom-up, so on a plain ``TreeNode`` tree the walk has to
+reach every node before any key is known, and a hit only saves the
+metric arithmetic. :func:`construct_keyed_tree` instead stores each
+subtree's key and size on its :class:`KeyedNode` as the tree is built,
+in one reverse pass over the new nodes. The memo then probes top-down
+and a hit skips the whole subtree below it, so a regraded tree seen
+before costs one lookup.
+"""
+
+from collections import OrderedDict, namedtuple
+
+from .tree import TreeNode, _build_nodes
+
+MemoInfo = namedtuple("MemoInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# Key of the empty subtree, and its (key, size, height, diameter, balanced).
+_EMPTY = 0
+_EMPTY_ENTRY = (_EMPTY, 0, 0, 0, True)
+_EMPTY_METRICS = _EMPTY_ENTRY[2:]
+
+
+def subtree_hash(root):
+    """Return the structural key of the tree rooted at ``root``."""
+    keys = []
+    stack = [(root, False)] if root else []
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            right = keys.pop() if node.right else _EMPTY
+            left = keys.pop() if node.left else _EMPTY
+            keys.append(hash((node.val, left, right)))
+        else:
+            stack.append((node, True))
+            if node.right:
+                stack.append((node.right, False))
+            if node.left:
+                stack.append((node.left, False))
+    return keys[0] if keys else _EMPTY
+
+
+class KeyedNode(TreeNode):
+    """``TreeNode`` that also holds its subtree's ``key`` and ``size``."""
+
+    __slots__ = ("key", "size")
+
+
+def construct_keyed_tree(preorder, inorder):
+    """Build like ``construct_binary_tree``, with :class:`KeyedNode` nodes.
+
+    Nodes are created in preorder, so walking the new nodes backwards
+    finishes every child before its parent and fills in the keys without
+    a stack. The keys match :func:`subtree_hash`.
+    """
+    nodes = _build_nodes(preorder, inorder, KeyedNode)
+    for node in reversed(nodes):
+        left, right = node.left, node.right
+        if left:
+            lk, ls = left.key, left.size
+        else:
+            lk, ls = _EMPTY, 0
+        if right:
+            rk, rs = right.key, right.size
+        else:
+            rk, rs = _EMPTY, 0
+        node.key = hash((node.val, lk, rk))
+        node.size = ls + rs + 1
+    return nodes[0] if nodes else None
+
+
+class SubtreeMemo:
+    """Bounded LRU of ``(height, diameter, balanced)`` keyed by subtree hash.
+
+    The root of each evaluated tree is always looked up and stored, so a
+    small tree seen before, such as the six-node sample trees, is one hit.
+    Below the root only subtrees of at least ``min_size`` nodes are; smaller
+    ones are cheaper to recompute than to hash-probe, and would otherwise
+    evict the entries worth keeping.
+    """
+
+    def __init__(self, maxsize=4096, min_size=64):
+        self.maxsize = maxsize
+        self.min_size = min_size
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def info(self):
+        """Return hit/miss counters in the shape of ``functools`` ``cache_info``."""
+        return MemoInfo(self.hits, self.misses, self.maxsize, len(self._cache))
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+    def _get(self, key, size):
+        entry = self._cache.get(key)
+        if entry is None or entry[0] != size:
+            self.misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self.hits += 1
+        return entry[1:]
+
+    def _put(self, key, size, value):
+        self._cache[key] = (size,) + value
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def metrics(self, root):
+        """Return ``(height, diameter, balanced)`` for ``root``, via the memo.
+
+        A plain tree is rehashed on every call, so edits made to it between
+        calls are seen. A tree from :func:`construct_keyed_tree` skips every
+        subtree already in the memo, but its keys are fixed when it is built
+        and it must not be changed afterwards.
+        """
+        if root is None:
+            return 0, 0, True
+        if isinstance(root, KeyedNode):
+            return self._walk_keyed(root)
+        return self._walk(root)
+
+    def _walk(self, root):
+        # Each entry of ``done`` is (key, size, height, diameter, balanced)
+        # for a finished subtree.
+        done = []
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if not expanded:
+                stack.append((node, True))
+                if node.right:
+                    stack.append((node.right, False))
+                if node.left:
+                    stack.append((node.left, False))
+                continue
+
+            rk, rs, rh, rd, rb = done.pop() if node.right else _EMPTY_ENTRY
+            lk, ls, lh, ld, lb = done.pop() if node.left else _EMPTY_ENTRY
+            key = hash((node.val, lk, rk))
+            size = ls + rs + 1
+            if size >= self.min_size or node is root:
+                cached = self._get(key, size)
+                if cached is None:
+                    cached = _combine(lh, ld, lb, rh, rd, rb)
+                    self._put(key, size, cached)
+                done.append((key, size) + cached)
+            else:
+                done.append((key, size) + _combine(lh, ld, lb, rh, rd, rb))
+        return done[0][2:]
+
+    def _walk_keyed(self, root):
+        # Keys are already on the nodes, so a subtree is probed before it
+        # is expanded and a hit never looks below it.
+        min_size = self.min_size
+        done = []
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if not expanded:
+                if node.size >= min_size or node is root:
+                    cached = self._get(node.key, node.size)
+                    if cached is not None:
+                        done.append(cached)
+                        continue
+                stack.append((node, True))
+                if node.right:
+                    stack.append((node.right, False))
+                if node.left:
+                    stack.append((node.left, False))
+                continue
+
+            rh, rd, rb = done.pop() if node.right else _EMPTY_METRICS
+            lh, ld, lb = done.pop() if node.left else _EMPTY_METRICS
+            result = _combine(lh, ld, lb, rh, rd, rb)
+            if node.size >= min_size or node is root:
+                self._put(node.key, node.size, result)
+            done.append(result)
+        return done[0]
+
+
+def _combine(lh, ld, lb, rh, rd, rb):
+    return (
+        1 + (lh if lh > rh else rh),
+        max(lh + rh + 1, ld, rd),
+        lb and rb and -1 <= lh - rh <= 1,
+    )
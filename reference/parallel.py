@@ -0,0 +1,126 @@
+"""Process-parallel metric evaluation for very large array-backed trees.
+
+A :class:`~reference.compact.CompactTree` is laid out in preorder, so the
+subtree under any node is one contiguous index range. :func:`parallel_metrics`
+cuts the tree at a frontier depth. It puts the child arrays in
+``multiprocessing.shared_memory`` and has a ``ProcessPoolExecutor``
+evaluate each frontier subtree's range independently; workers attach to
+the block by name and copy nothing. The per-subtree ``(height, diameter,
+balanced, leaves)`` tuples are then folded through the few nodes above
+the frontier in the parent process.
+"""
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+# Set in each worker by _attach: the shared block and int64 views of the
+# left and right child arrays inside it.
+_shm = None
+_left = None
+_right = None
+
+
+def _attach(name, n):
+    global _shm, _left, _right
+    _shm = shared_memory.SharedMemory(name=name)
+    words = _shm.buf.cast("q")
+    _left, _right = words[:n], words[n:2 * n]
+
+
+def _subtree_end(left, right, root):
+    """Return the last preorder index inside ``root``'s subtree."""
+    node = root
+    while True:
+        if right[node] >= 0:
+            node = right[node]
+        elif left[node] >= 0:
+            node = left[node]
+        else:
+            return node
+
+
+def _evaluate(left, right, root):
+    """Return ``(height, diameter, balanced, leaves)`` for one subtree."""
+    end = _subtree_end(left, right, root)
+    size = end - root + 1
+    # Node j of the subtree is stored at heights[j - root].
+    heights = array("q", [0]) * size
+    diameter, balanced, leaves = 0, True, 0
+    for i in range(end, root - 1, -1):
+        l, r = left[i], right[i]
+        lh = heights[l - root] if l >= 0 else 0
+        rh = heights[r - root] if r >= 0 else 0
+        heights[i - root] = 1 + (lh if lh > rh else rh)
+        if lh + rh + 1 > diameter:
+            diameter = lh + rh + 1
+        if lh - rh > 1 or rh - lh > 1:
+            balanced = False
+        if l < 0 and r < 0:
+            leaves += 1
+    return heights[0], diameter, balanced, leaves
+
+
+def _evaluate_shared(root):
+    return _evaluate(_left, _right, root)
+
+
+def _split(tree, min_subtrees):
+    """Return ``(top, frontier)`` node lists for the shallowest wide-enough cut."""
+    left, right = tree.left, tree.right
+    top, frontier = [], [0] if len(tree) else []
+    while frontier and len(frontier) < min_subtrees:
+        next_level = []
+        for i in frontier:
+            top.append(i)
+            if left[i] >= 0:
+                next_level.append(left[i])
+            if right[i] >= 0:
+                next_level.append(right[i])
+        frontier = next_level
+    return top, frontier
+
+
+def parallel_metrics(tree, workers=None, min_subtrees=None):
+    """Return ``(height, diameter, balanced, leaf_count)`` using a process pool.
+
+    The tree is cut at the shallowest level with at least
+    ``min_subtrees`` nodes (default ``4 * workers``), so the pool can
+    even out uneven subtrees. ``workers`` defaults to the CPU count.
+    Deep, narrow trees may never reach a wide enough level; they simply
+    end up with fewer, larger tasks.
+    """
+    n = len(tree)
+    if not n:
+        return 0, 0, True, 0
+    workers = workers or os.cpu_count() or 1
+    top, frontier = _split(tree, min_subtrees or 4 * workers)
+
+    results = {}
+    if frontier:
+        shm = shared_memory.SharedMemory(create=True, size=16 * n)
+        try:
+            words = shm.buf.cast("q")
+            words[:n] = memoryview(tree.left)
+            words[n:2 * n] = memoryview(tree.right)
+            words.release()
+            with ProcessPoolExecutor(workers, initializer=_attach, initargs=(shm.name, n)) as pool:
+                results = dict(zip(frontier, pool.map(_evaluate_shared, frontier)))
+        finally:
+            shm.close()
+            shm.unlink()
+
+    # Fold the nodes above the frontier; children always have larger
+    # indices than parents, so descending order is a valid post-order.
+    missing = (0, 0, True, 0)
+    for i in sorted(top, reverse=True):
+        lh, ld, lb, ll = results.get(tree.left[i], missing)
+        rh, rd, rb, rl = results.get(tree.right[i], missing)
+        results[i] = (
+            1 + max(lh, rh),
+            max(lh + rh + 1, ld, rd),
+            lb and rb and abs(lh - rh) <= 1,
+            ll + rl or 1,
+        )
+    return results[0]
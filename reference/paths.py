@@ -0,0 +1,72 @@
+"""Compact encoding of every root-to-leaf path in a tree.
+
+``print_all_paths`` copies the full path at each leaf, O(leaves * height)
+values in total. :class:`PathSet` keeps one parent index and one value per
+node plus the list of leaves, O(n), and rebuilds any path on demand.
+Values are an ``array('q')``, or a plain list when a tree holds values
+that are not plain ints in int64 range.
+"""
+
+from array import array
+
+
+class PathSet:
+    """Root-to-leaf paths as a parent-pointer array plus leaf ids.
+
+    ``paths[i]`` is the i-th path from the left, the same order as
+    ``print_all_paths``; iterating yields every path in that order.
+    """
+
+    __slots__ = ("values", "parents", "leaves")
+
+    def __init__(self, values, parents, leaves):
+        self.values = values
+        self.parents = parents
+        self.leaves = leaves
+
+    @classmethod
+    def from_node(cls, root):
+        """Encode the paths of a ``TreeNode`` tree in one preorder walk."""
+        values, parents, leaves = array("q"), array("q"), array("q")
+        stack = [(root, -1)] if root else []
+        while stack:
+            node, parent = stack.pop()
+            i = len(values)
+            if values.__class__ is array:
+                try:
+                    # array('q') would store a bool (or other int subclass) as int.
+                    if node.val.__class__ is not int:
+                        raise TypeError
+                    values.append(node.val)
+                except (TypeError, OverflowError):
+                    # Not an int64 value: keep the values in a plain list.
+                    values = values.tolist()
+                    values.append(node.val)
+            else:
+                values.append(node.val)
+            parents.append(parent)
+            if not node.left and not node.right:
+                leaves.append(i)
+            else:
+                if node.right:
+                    stack.append((node.right, i))
+                if node.left:
+                    stack.append((node.left, i))
+        return cls(values, parents, leaves)
+
+    def __len__(self):
+        return len(self.leaves)
+
+    def __getitem__(self, index):
+        values, parents = self.values, self.parents
+        path = []
+        node = self.leaves[index]
+        while node >= 0:
+            path.append(values[node])
+            node = parents[node]
+        path.reverse()
+        return path
+
+    def __iter__(self):
+        for index in range(len(self.leaves)):
+            yield self[index]
@@ -0,0 +1,115 @@
+"""Spiral (zig-zag) level order as one flat buffer plus level offsets.
+
+``level_order_spiral`` returns a list per level, which on wide trees means
+millions of small objects. :class:`SpiralOrder` stores every value in a
+single ``array('q')`` in spiral order and the level boundaries in a second
+one, CSR style: level ``k`` is ``values[offsets[k]:offsets[k + 1]]``.
+Trees whose values are not all plain ints in int64 range (strings, floats,
+bools, huge ints) get a plain list for ``values`` instead, which has no
+zero-copy views.
+"""
+
+from array import array
+
+
+class SpiralOrder:
+    """Spiral level order in CSR form.
+
+    Indexing and iteration give levels as zero-copy ``memoryview`` slices,
+    or list slices when ``values`` is a list; :meth:`to_lists` gives the
+    nested-list shape the suite prints.
+    """
+
+    __slots__ = ("values", "offsets")
+
+    def __init__(self, values, offsets):
+        self.values = values
+        self.offsets = offsets
+
+    @classmethod
+    def from_node(cls, root):
+        """Collect the spiral order of a ``TreeNode`` tree with one BFS."""
+        values, offsets = array("q"), array("q", [0])
+        level, left_to_right = [root] if root else [], True
+        while level:
+            vals = [node.val for node in level]
+            if not left_to_right:
+                vals.reverse()
+            if values.__class__ is list:
+                values.extend(vals)
+            elif set(map(type, vals)) != {int}:
+                # array('q') would store bool (and other int subclasses) as int.
+                values = values.tolist() + vals
+            else:
+                filled = len(values)
+                try:
+                    values.extend(vals)
+                except OverflowError:
+                    # array.extend may have appended part of the level.
+                    values = values[:filled].tolist() + vals
+            offsets.append(len(values))
+            next_level = []
+            for node in level:
+                if node.left:
+                    next_level.append(node.left)
+                if node.right:
+                    next_level.append(node.right)
+            level, left_to_right = next_level, not left_to_right
+        return cls(values, offsets)
+
+    @classmethod
+    def from_compact(cls, tree):
+        """Collect the spiral order of a :class:`~reference.compact.CompactTree`."""
+        tree_values, left, right = tree.values, tree.left, tree.right
+        values, offsets = array("q"), array("q", [0])
+        level, left_to_right = [0] if len(tree_values) else [], True
+        while level:
+            vals = [tree_values[i] for i in level]
+            if not left_to_right:
+                vals.reverse()
+            values.extend(vals)
+            offsets.append(len(values))
+            next_level = []
+            for i in level:
+                if left[i] >= 0:
+                    next_level.append(left[i])
+                if right[i] >= 0:
+                    next_level.append(right[i])
+            level, left_to_right = next_level, not left_to_right
+        return cls(values, offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def _slices(self):
+        values = self.values
+        return values if isinstance(values, list) else memoryview(values)
+
+    def __getitem__(self, level):
+        if level < 0:
+            level += len(self)
+        if not 0 <= level < len(self):
+            raise IndexError("level out of range")
+        return self._slices()[self.offsets[level]:self.offsets[level + 1]]
+
+    def __iter__(self):
+        view, offsets = self._slices(), self.offsets
+        for level in range(len(offsets) - 1):
+            yield view[offsets[level]:offsets[level + 1]]
+
+    def view(self):
+        """Zero-copy ``memoryview`` over all values in spiral order."""
+        return memoryview(self.values)
+
+    def to_numpy(self):
+        """Zero-copy int64 NumPy array over all values; requires NumPy."""
+        import numpy
+
+        return numpy.frombuffer(self.values, dtype=numpy.int64)
+
+    def to_lists(self):
+        """Return the nested-list form produced by ``level_order_spiral``."""
+        values, offsets = self.values, self.offsets
+        if isinstance(values, list):
+            return [values[offsets[k]:offsets[k + 1]] for k in range(len(offsets) - 1)]
+        return [values[offsets[k]:offsets[k + 1]].tolist() for k in range(len(offsets) - 1)]
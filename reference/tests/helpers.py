@@ -0,0 +1,53 @@
+"""Helpers shared by the reference test modules."""
+
+import random
+
+from reference.generator import SHAPES, generate_traversals, random_traversals
+
+SEEDS = range(40)
+
+
+def sample_traversals():
+    """Return ``(preorder, inorder)`` lists for empty, tiny, skewed, shaped and random trees.
+
+    The legacy functions recurse, so every tree stays well under the
+    recursion limit.
+    """
+    cases = [([], []), ([1], [1])]
+    cases.append((list(range(300)), list(range(299, -1, -1))))  # left chain
+    cases.append((list(range(300)), list(range(300))))  # right chain
+    for shape in SHAPES:
+        preorder, inorder = generate_traversals(shape, 200, seed=1)
+        cases.append((list(preorder), list(inorder)))
+    for seed in SEEDS:
+        cases.append(random_traversals(random.Random(seed).randint(2, 150), seed))
+    return cases
+
+
+def lca_val(node):
+    """Return the value of an LCA answer node, or ``None``."""
+    return node.val if node else None
+
+
+def traversals(root):
+    """Return the ``(preorder, inorder)`` value lists of a ``TreeNode`` tree."""
+    preorder, inorder, stack, node = [], [], [], root
+    while stack or node:
+        while node:
+            preorder.append(node.val)
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        inorder.append(node.val)
+        node = node.right
+    return preorder, inorder
+
+
+def relabel(root, convert):
+    """Replace every value of a ``TreeNode`` tree with ``convert(value)``."""
+    stack = [root] if root else []
+    while stack:
+        node = stack.pop()
+        node.val = convert(node.val)
+        stack.extend(child for child in (node.left, node.right) if child)
+    return root
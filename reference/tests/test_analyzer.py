@@ -0,0 +1,35 @@
+import random
+
+import pytest
+
+from reference import TreeAnalysis, analyze_tree, construct_binary_tree, legacy
+from reference.tests.helpers import lca_val, sample_traversals
+
+
+@pytest.mark.parametrize("preorder, inorder", sample_traversals())
+def test_analysis_matches_legacy(preorder, inorder):
+    root = construct_binary_tree(preorder, inorder)
+    old = legacy.construct_binary_tree(preorder[:], inorder[:])
+    height, diameter = legacy.find_height_and_diameter(old)
+    rng = random.Random(len(preorder))
+    for _ in range(10):
+        p, q = rng.randint(-1, len(preorder)), rng.randint(-1, len(preorder))
+        assert analyze_tree(root, p, q) == TreeAnalysis(
+            height, diameter, legacy.level_order_spiral(old), legacy.is_balanced(old),
+            lca_val(legacy.find_lca(old, p, q)), legacy.print_all_paths(old),
+        )
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_lca_follows_find_lca_with_repeated_values(seed):
+    rng = random.Random(seed)
+    preorder, inorder = sample_traversals()[seed + 10]
+    root = construct_binary_tree(preorder, inorder)
+    stack = [root] if root else []
+    while stack:
+        node = stack.pop()
+        node.val %= 4
+        stack.extend(child for child in (node.left, node.right) if child)
+    for _ in range(10):
+        p, q = rng.randrange(5), rng.randrange(5)
+        assert analyze_tree(root, p, q).lca_result == lca_val(legacy.find_lca(root, p, q))
@@ -0,0 +1,208 @@
+import random
+from math import isqrt
+
+import pytest
+
+from reference import Array, CustomArray, arrays, legacy
+from reference.arrays import STORAGE, BlockList
+
+_METHODS = {
+    "insert": "insert", "delete": "delete", "linear": "linear_search",
+    "binary": "binary_search", "bubble": "bubble_sort", "selection": "selection_sort",
+    "rotate": "rotate",
+}
+
+
+def _call(obj, name, args):
+    try:
+        result = getattr(obj, name)(*args)
+    except IndexError as exc:
+        return "IndexError", str(exc)
+    return "ok", result
+
+
+@pytest.mark.parametrize("indexed, reindex_scans", [(False, 16), (True, 16), (True, 0)])
+@pytest.mark.parametrize("storage", STORAGE)
+@pytest.mark.parametrize("cls, old_cls, attr", [
+    (Array, legacy.Array, "data"), (CustomArray, legacy.CustomArray, "array"),
+])
+def test_arrays_match_legacy(cls, old_cls, attr, storage, indexed, reindex_scans, monkeypatch):
+    monkeypatch.setattr(arrays, "_REINDEX_SCANS", reindex_scans)
+    for seed in range(30):
+        rng = random.Random(seed)
+        arr, old = cls(storage=storage, indexed=indexed), old_cls()
+        for _ in range(150):
+            n = len(getattr(old, attr))
+            op = rng.choice(["insert"] * 3 + ["delete"] * 2 + ["linear"] * 3 + list(_METHODS)[3:])
+            args = {
+                "insert": (rng.randint(-3, n + 3), rng.randint(0, 20)),
+                "delete": (rng.randint(-2, n + 2),),
+                "linear": (rng.randint(0, 20),),
+                "binary": (rng.randint(0, 20),),
+                "rotate": (rng.randint(-5, 30),),
+            }.get(op, ())
+            if op == "rotate" and not n:
+                continue  # the legacy rotate divides by the length
+            assert _call(arr, _METHODS[op], args) == _call(old, _METHODS[op], args), (op, args)
+            assert list(arr) == list(getattr(old, attr))
+
+
+@pytest.mark.parametrize("storage", STORAGE)
+def test_sorted_flag_survives_order_preserving_changes(storage):
+    arr = Array([5, 1, 4, 2], storage)
+    assert not arr._sorted
+    assert arr.binary_search(4) == 2
+    assert arr._sorted
+    arr.insert(2, 3)
+    arr.delete(0)
+    assert arr._sorted
+    assert [arr.binary_search(value) for value in (2, 3, 4, 5)] == [0, 1, 2, 3]
+    arr.insert(0, 9)
+    assert not arr._sorted
+    arr.bubble_sort()
+    arr.rotate(1)
+    assert not arr._sorted
+
+
+def test_int64_storage_shares_its_buffer():
+    arr = CustomArray([3, 1, 2], storage="int64")
+    arr.rotate(1)
+    view = arr.view()
+    assert view.format == "q" and view.tolist() == [2, 3, 1]
+    with pytest.raises(BufferError):
+        arr.insert(0, 7)
+    view.release()
+    arr.insert(0, 7)
+    assert list(arr.array) == [7, 2, 3, 1]
+    with pytest.raises(TypeError):
+        CustomArray([1]).view()
+    with pytest.raises(ValueError):
+        CustomArray(storage="float")
+
+
+@pytest.mark.parametrize("storage", STORAGE)
+def test_elements_print_and_compare_like_a_list(storage):
+    arr = CustomArray([10, 5, 7], storage)
+    for result in (arr.bubble_sort(), arr.selection_sort(), arr.array):
+        assert repr(result) == str(result) == "[5, 7, 10]"
+        assert result == [5, 7, 10]
+    old = Array([3, 1, 2], storage)
+    old.bubble_sort()
+    assert old.data == [1, 2, 3] and repr(old.data) == "[1, 2, 3]"
+
+
+def test_rotate_returns_the_rotated_elements():
+    arr = CustomArray([5, 10])
+    assert repr(arr.rotate(1)) == "[10, 5]"
+    assert arr.rotate(1) == [5, 10]
+    arr = Array([1, 2, 3, 4], storage="int64")
+    arr.rotate(-1)
+    arr.rotate(6)
+    assert list(arr) == list(arr.data) == [4, 1, 2, 3]
+    assert arr[0] == arr[-4] == 4
+    with pytest.raises(IndexError):
+        arr[4]
+
+
+def test_rejected_int64_insert_changes_nothing():
+    arr = CustomArray([1, 2, 3, 4], storage="int64", indexed=True)
+    arr.rotate(1)
+    assert arr.linear_search(4) == 0
+    for value in (2 ** 70, "x"):
+        with pytest.raises((OverflowError, TypeError)):
+            arr.insert(4, value)
+    assert list(arr) == [4, 1, 2, 3]
+    assert arr.linear_search("x") == -1
+
+
+@pytest.mark.parametrize("storage", STORAGE)
+def test_value_index_finds_the_first_logical_occurrence(storage, monkeypatch):
+    monkeypatch.setattr(arrays, "_REINDEX_SCANS", 0)
+    arr = CustomArray([7, 1, 7, 2, 7], storage, indexed=True)
+    assert arr.linear_search(7) == 0
+    assert arr._index is not None
+    arr.rotate(2)
+    assert list(arr) == [2, 7, 7, 1, 7]
+    assert [arr.linear_search(value) for value in (7, 2, 1, 9)] == [1, 0, 3, -1]
+    arr.insert(5, 9)
+    assert arr.linear_search(9) == 5
+
+
+@pytest.mark.parametrize("rebuild", [False, True])
+@pytest.mark.parametrize("storage", STORAGE)
+def test_batch_calls_match_single_calls(storage, rebuild, monkeypatch):
+    monkeypatch.setattr(arrays, "_rebuild_pays", lambda size, count: rebuild)
+    for seed in range(30):
+        rng = random.Random(seed)
+        values = [rng.randrange(30) for _ in range(rng.randrange(60))]
+        batch, single = CustomArray(values, storage), CustomArray(values, storage)
+        positions = [rng.randint(0, len(values) + k) for k in range(20)]
+        new = [rng.randrange(30) for _ in positions]
+        batch.insert_many(positions, new)
+        for position, value in zip(positions, new):
+            single.insert(position, value)
+        assert list(batch) == list(single)
+        positions = [rng.randint(0, len(single) - 1 - k) for k in range(min(10, len(single)))]
+        batch.delete_many(positions)
+        for position in positions:
+            single.delete(position)
+        assert list(batch) == list(single)
+        targets = list(range(35))
+        assert batch.search_many(targets) == [single.linear_search(value) for value in targets]
+
+
+def test_block_list_retunes_as_it_grows_and_shrinks():
+    ref, blocks, rng = [], BlockList(), random.Random(0)
+    for k in range(20000):
+        position = rng.randint(0, k)
+        ref.insert(position, k)
+        blocks.insert(position, k)
+    assert list(blocks) == ref
+    assert isqrt(len(ref)) // 2 <= blocks._load <= isqrt(len(ref))
+    while len(ref) > 100:
+        position = rng.randrange(len(ref))
+        assert blocks.pop(position) == ref.pop(position)
+    assert list(blocks) == ref
+    assert blocks._load == BlockList.MIN_LOAD
+
+
+def test_block_list_reads_like_a_list():
+    ref = [random.Random(1).randrange(50) for _ in range(3000)]
+    blocks = BlockList(ref, load=64)
+    assert [blocks[i] for i in (0, 1234, -1)] == [ref[0], ref[1234], ref[-1]]
+    for value in (ref[2000], ref[5]):
+        assert blocks.index(value) == ref.index(value)
+        assert blocks.index(value, 100, 2900) == ref.index(value, 100, 2900)
+    with pytest.raises(ValueError):
+        blocks.index(50)
+    blocks.sort()
+    assert list(blocks) == sorted(ref)
+
+
+@pytest.mark.parametrize("storage", STORAGE)
+def test_search_many_on_sorted_data_skips_unorderable_values(storage):
+    arr = Array([3, 1, 2], storage)
+    arr.bubble_sort()
+    targets = ["x", 2, None, 2.0, 2 ** 70, 3]
+    assert arr.search_many(targets) == [arr.linear_search(value) for value in targets] == [-1, 1, -1, 1, -1, 2]
+
+
+@pytest.mark.parametrize("storage", ["list", "blocked"])
+def test_search_many_scans_for_unhashable_values(storage):
+    arr = CustomArray([1, 2, 3] * 10, storage)
+    targets = [[2]] * 16 + [2, 3]
+    assert arr.search_many(targets) == [arr.linear_search(value) for value in targets] == [-1] * 16 + [1, 2]
+    arr = CustomArray([[1], 2, [3]] * 10, storage)
+    targets = [[3]] * 16 + [2, 7]
+    assert arr.search_many(targets) == [arr.linear_search(value) for value in targets] == [2] * 16 + [1, -1]
+
+
+@pytest.mark.parametrize("storage", ["list", "blocked"])
+def test_value_index_scans_for_unhashable_values(storage, monkeypatch):
+    monkeypatch.setattr(arrays, "_REINDEX_SCANS", 0)
+    arr = CustomArray([1, 2, 3], storage, indexed=True)
+    assert arr.linear_search(2) == 1 and arr._index is not None
+    assert arr.linear_search([2]) == -1
+    arr.insert(3, [4])
+    assert arr._index is None
+    assert [arr.linear_search(value) for value in ([4], 3, [5])] == [3, 2, -1]
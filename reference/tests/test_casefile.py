@@ -0,0 +1,81 @@
+import os
+import struct
+
+import pytest
+
+from reference import CaseFile, CaseWriter, TreeCase, write_cases
+from reference.casefile import MAGIC
+from reference.generator import SHAPES, generate_case
+
+
+def _mappings(path):
+    with open("/proc/self/maps") as maps:
+        return sum(line.rstrip().endswith(str(path)) for line in maps)
+
+
+def test_case_file_round_trip_and_failed_write(tmp_path):
+    cases = [generate_case(shape, 50, seed=2, queries=5) for shape in SHAPES[:3]]
+    bad = cases[1]._replace(expected=cases[1].expected._replace(lca=[1]))
+    path = tmp_path / "cases.bin"
+    with CaseWriter(path) as writer:
+        writer.write(cases[0])
+        with pytest.raises(ValueError):
+            writer.write(bad)
+        writer.write(cases[2]._replace(expected=cases[2].expected._replace(lca=[None] * 5)))
+    with CaseFile(path) as case_file:
+        read = [(list(c.preorder), list(c.expected.lca), c.expected.spiral.to_lists()) for c in case_file]
+    assert read == [
+        (list(cases[0].preorder), list(cases[0].expected.lca), cases[0].expected.spiral.to_lists()),
+        (list(cases[2].preorder), [None] * 5, cases[2].expected.spiral.to_lists()),
+    ]
+
+
+@pytest.mark.parametrize("queries", [
+    [1, 2, 2, 3], [(1, 2), (2, 3)], [[1, 2], [2, 3]], [(1, 2), 2, 3], iter([[1, 2], range(2, 4)]),
+])
+def test_queries_flat_or_as_any_pairs(tmp_path, queries):
+    path = tmp_path / "cases.bin"
+    write_cases(path, [TreeCase([1, 2, 3], [2, 1, 3], queries)])
+    with CaseFile(path) as case_file:
+        assert case_file[0].pairs() == [(1, 2), (2, 3)]
+
+
+@pytest.mark.parametrize("queries", [[1, 2, 3], [(1, 2, 3)], [(1,), 2]])
+def test_queries_that_are_not_pairs(tmp_path, queries):
+    with CaseWriter(tmp_path / "cases.bin") as writer:
+        with pytest.raises(ValueError):
+            writer.write(TreeCase([1], [1], queries))
+        assert writer.count == 0
+
+
+def test_reads_version_1_files(tmp_path):
+    case = generate_case("random", 40, seed=3, queries=4)
+    case = case._replace(expected=case.expected._replace(spiral=None))
+    path = tmp_path / "v1.bin"
+    write_cases(path, [case, case])
+    with open(path, "r+b") as f:
+        f.write(struct.pack("=8sq", MAGIC, 1))
+    with CaseFile(path) as case_file:
+        assert len(case_file) == 2
+        read = case_file[1]
+        assert list(read.preorder) == list(case.preorder)
+        assert read.expected.lca == list(case.expected.lca)
+        assert read.expected.spiral is None
+        del read
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/maps"), reason="needs /proc/self/maps")
+@pytest.mark.parametrize("header, tail", [
+    (struct.pack("=8sqq", b"NOTCASES", 2, 0), b""),
+    (struct.pack("=8sqq", MAGIC, 3, 0), b""),
+    (struct.pack("=8sqq", MAGIC, 2, 1), b""),
+    (struct.pack("=8sqq", MAGIC, 2, 0), b"\0" * 8),
+    (struct.pack("=8sqq", MAGIC, 2, 0), b"\0"),
+])
+def test_rejected_files_are_unmapped(tmp_path, header, tail):
+    path = tmp_path / "bad.bin"
+    path.write_bytes(header + tail)
+    with pytest.raises(ValueError) as info:
+        CaseFile(path)
+    # The traceback still references the half-built CaseFile.
+    assert info.traceback and _mappings(path) == 0
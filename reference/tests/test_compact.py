@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from reference import (
+    CompactTree,
+    TraversalError,
+    construct_binary_tree,
+    find_diameter_path,
+    legacy,
+    to_level_order,
+)
+from reference.tests.helpers import sample_traversals, traversals
+
+
+@pytest.mark.parametrize("preorder, inorder", sample_traversals())
+def test_compact_tree_matches_legacy(preorder, inorder):
+    old = legacy.construct_binary_tree(preorder[:], inorder[:])
+    compact = CompactTree.from_traversals(preorder, inorder)
+    assert list(compact.values) == preorder
+    assert compact.height_and_diameter() == legacy.find_height_and_diameter(old)
+    assert compact.is_balanced() == legacy.is_balanced(old)
+    assert compact.spiral_order() == legacy.level_order_spiral(old)
+    assert compact.paths() == legacy.print_all_paths(old)
+    rng = random.Random(len(preorder))
+    for _ in range(10):
+        p, q = rng.randint(-1, len(preorder)), rng.randint(-1, len(preorder))
+        node = legacy.find_lca(old, p, q)
+        i = compact.lca(p, q)
+        assert (compact.values[i] if i >= 0 else None) == (node.val if node else None)
+
+
+@pytest.mark.parametrize("validate", [False, True])
+def test_traversals_that_fit_no_tree(validate):
+    with pytest.raises(TraversalError) as info:
+        CompactTree.from_traversals([1, 2, 3], [3, 1, 2], validate)
+    assert info.value.kind == "order"
+    rng = random.Random(0)
+    for _ in range(500):
+        preorder = rng.sample(range(8), rng.randint(2, 8))
+        inorder = rng.sample(preorder, len(preorder))
+        try:
+            compact = CompactTree.from_traversals(preorder, inorder, validate)
+        except TraversalError as exc:
+            assert exc.kind == "order"
+        else:
+            assert traversals(compact.to_node()) == (preorder, inorder)
+
+
+@pytest.mark.parametrize("preorder, inorder", sample_traversals()[:10])
+def test_node_round_trip(preorder, inorder):
+    compact = CompactTree.from_node(construct_binary_tree(preorder, inorder))
+    assert traversals(compact.to_node()) == (preorder, inorder)
+    rebuilt = CompactTree.from_traversals(preorder, inorder)
+    assert (compact.values, compact.left, compact.right) == (rebuilt.values, rebuilt.left, rebuilt.right)
+
+
+@pytest.mark.parametrize("preorder, inorder", sample_traversals())
+def test_level_order_round_trip(preorder, inorder):
+    values = to_level_order(construct_binary_tree(preorder, inorder))
+    compact = CompactTree.from_level_order(values)
+    assert traversals(compact.to_node()) == (preorder, inorder)
+    assert compact.to_level_order() == values
+    for bad in ([None, 1], [1, None, None, 2]):
+        with pytest.raises(ValueError):
+            CompactTree.from_level_order(bad)
+
+
+@pytest.mark.parametrize("preorder, inorder", sample_traversals())
+def test_diameter_path_matches_the_node_version(preorder, inorder):
+    expected = find_diameter_path(construct_binary_tree(preorder, inorder))
+    path = CompactTree.from_traversals(preorder, inorder).diameter_path()
+    assert path[:2] == expected[:2] and path.path == expected.path
+    if preorder:
+        assert [preorder[i] for i in path[2:5]] == [node.val for node in expected[2:5]]
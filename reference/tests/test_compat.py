@@ -0,0 +1,17 @@
+from array import array
+
+import pytest
+
+from reference._compat import find
+
+
+@pytest.mark.parametrize("kind", [list, lambda values: array("q", values)])
+def test_find_stays_inside_its_bounds(kind):
+    items = kind([5, 3, 5, 7, 3])
+    assert find(items, 5, 0, 5) == 0
+    assert find(items, 5, 1, 5) == 2
+    assert find(items, 3, 2, 5) == 4
+    with pytest.raises(ValueError):
+        find(items, 7, 0, 3)
+    with pytest.raises(ValueError):
+        find(items, 5, 3, 5)
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from reference import DynamicTree, TreeNode, construct_binary_tree, legacy
+from reference.tests.helpers import SEEDS, sample_traversals
+
+
+def _expected(root):
+    return legacy.find_height_and_diameter(root) + (legacy.is_balanced(root),)
+
+
+def _metrics(tree):
+    return tree.height, tree.diameter, tree.is_balanced
+
+
+@pytest.mark.parametrize("preorder, inorder", sample_traversals())
+def test_wrapped_tree_metrics_match_legacy(preorder, inorder):
+    tree = DynamicTree(construct_binary_tree(preorder, inorder))
+    assert len(tree) == len(preorder)
+    assert _metrics(tree) == _expected(tree.root)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_random_inserts_and_deletes_match_recomputation(seed):
+    rng = random.Random(seed)
+    tree = DynamicTree()
+    for value in range(120):
+        nodes = [tree.node(v) for v in range(value) if v in tree]
+        leaves = [node.val for node in nodes if not (node.left or node.right)]
+        if leaves and rng.random() < 0.35:
+            tree.delete(rng.choice(leaves))
+        else:
+            free = [(node.val, right) for node in nodes for right in (False, True)
+                    if (node.right if right else node.left) is None]
+            parent, right = rng.choice(free) if free else (None, False)
+            tree.insert(parent, value, right)
+        assert _metrics(tree) == _expected(tree.root)
+
+
+def test_growing_a_chain_and_a_sibling():
+    tree = DynamicTree()
+    assert _metrics(tree) == (0, 0, True)
+    root = tree.insert(None, 1)
+    assert tree.root is root and _metrics(tree) == (1, 1, True)
+    tree.insert(1, 2)
+    tree.insert(2, 3)
+    assert _metrics(tree) == (3, 3, False)
+    tree.insert(1, 4, right=True)
+    assert _metrics(tree) == (3, 4, True)
+    tree.delete(4)
+    tree.delete(3)
+    assert _metrics(tree) == (2, 2, True)
+    tree.delete(2)
+    tree.delete(1)
+    assert tree.root is None and len(tree) == 0 and _metrics(tree) == (0, 0, True)
+
+
+def test_deep_chain_updates_without_recursion():
+    n = 20000
+    tree = DynamicTree(construct_binary_tree(list(range(n)), list(range(n))))
+    assert _metrics(tree) == (n, n, False)
+    tree.insert(n - 1, n, right=True)
+    assert (tree.height, tree.diameter) == (n + 1, n + 1)
+    tree.delete(n)
+    tree.delete(n - 1)
+    assert (tree.height, tree.diameter) == (n - 1, n - 1)
+
+
+def test_rejected_changes_leave_the_tree_alone():
+    tree = DynamicTree(construct_binary_tree([1, 2, 3], [2, 1, 3]))
+    with pytest.raises(ValueError, match="duplicate"):
+        tree.insert(2, 3)
+    with pytest.raises(ValueError, match="left child"):
+        tree.insert(1, 4)
+    with pytest.raises(ValueError, match="not a leaf"):
+        tree.delete(1)
+    with pytest.raises(KeyError):
+        tree.insert(9, 4)
+    with pytest.raises(KeyError):
+        tree.delete(9)
+    twice = TreeNode(1)
+    twice.right = TreeNode(1)
+    with pytest.raises(ValueError, match="duplicate"):
+        DynamicTree(twice)
+    assert len(tree) == 3 and 4 not in tree
+    assert _metrics(tree) == (2, 3, True)
@@ -0,0 +1,35 @@
+import pytest
+
+from reference import construct_binary_tree, legacy
+from reference.generator import SHAPES, generate_case, generate_traversals
+from reference.tests.helpers import lca_val, traversals
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 7, 300])
+@pytest.mark.parametrize("shape", SHAPES)
+def test_generated_case_matches_legacy(shape, n):
+    case = generate_case(shape, n, seed=4, queries=20)
+    preorder, inorder = list(case.preorder), list(case.inorder)
+    assert sorted(inorder) == list(range(n))
+    assert traversals(construct_binary_tree(preorder, inorder)) == (preorder, inorder)
+    old = legacy.construct_binary_tree(preorder[:], inorder[:])
+    expected = case.expected
+    assert (expected.height, expected.diameter) == legacy.find_height_and_diameter(old)
+    assert expected.is_balanced == legacy.is_balanced(old)
+    assert expected.path_count == len(legacy.print_all_paths(old))
+    assert expected.spiral.to_lists() == legacy.level_order_spiral(old)
+    assert list(expected.lca) == [lca_val(legacy.find_lca(old, p, q)) for p, q in case.pairs()]
+
+
+@pytest.mark.parametrize(
+    "shape, height", [("balanced", 9), ("complete", 9), ("left_skewed", 300), ("right_skewed", 300), ("zigzag", 300)],
+)
+def test_shapes_have_their_height(shape, height):
+    assert generate_case(shape, 300, queries=0).expected.height == height
+
+
+def test_cases_depend_only_on_their_seed():
+    first, again, other = (generate_traversals("random", 100, seed) for seed in (1, 1, 2))
+    assert first == again != other
+    with pytest.raises(ValueError, match="unknown shape"):
+        generate_traversals("bushy", 10)
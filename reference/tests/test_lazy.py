@@ -0,0 +1,53 @@
+from array import array
+
+import pytest
+
+from reference import LazyTree, construct_binary_tree, legacy
+from reference.generator import random_traversals
+from reference.tests.helpers import traversals
+
+
+def _root_path(root, val):
+    """Values from ``root`` down to the node holding ``val`` (distinct values)."""
+    stack = [(root, [root.val])]
+    while stack:
+        node, path = stack.pop()
+        if node.val == val:
+            return path
+        for child in (node.left, node.right):
+            if child:
+                stack.append((child, path + [child.val]))
+    return None
+
+
+@pytest.mark.parametrize("wrap", [list, lambda vals: array("q", vals), lambda vals: memoryview(array("q", vals))])
+@pytest.mark.parametrize("seed", range(10))
+def test_lazy_tree_has_the_given_traversals(seed, wrap):
+    preorder, inorder = random_traversals(seed * 37, seed)
+    tree = LazyTree(wrap(preorder), wrap(inorder))
+    assert traversals(tree.root) == (preorder, inorder)
+    assert tree.materialized == len(preorder)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_lca_materializes_only_its_root_path(seed):
+    preorder, inorder = random_traversals(200, seed)
+    old = legacy.construct_binary_tree(preorder[:], inorder[:])
+    for p, q in [(preorder[seed], preorder[-seed - 1]), (inorder[seed], inorder[seed]), (preorder[0], inorder[-1])]:
+        tree = LazyTree(preorder, inorder)
+        node = tree.lca(p, q)
+        assert node.val == legacy.find_lca(old, p, q).val
+        assert tree.materialized == len(_root_path(old, node.val))
+    with pytest.raises(ValueError):
+        LazyTree(preorder, inorder).lca(preorder[0], -1)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_spiral_order_stops_at_max_levels(seed):
+    preorder, inorder = random_traversals(150, seed)
+    expected = legacy.level_order_spiral(construct_binary_tree(preorder, inorder))
+    assert LazyTree(preorder, inorder).spiral_order() == expected
+    tree = LazyTree(preorder, inorder)
+    assert tree.spiral_order(2) == expected[:2]
+    assert tree.materialized <= 3
+    assert LazyTree([], []).spiral_order() == []
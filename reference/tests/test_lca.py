@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from reference import LCAIndex, construct_binary_tree, legacy, offline_lca
+from reference.tests.helpers import lca_val, sample_traversals
+
+
+def _pairs(preorder, count=50, seed=0):
+    rng = random.Random(seed)
+    return [(rng.choice(preorder), rng.choice(preorder)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("preorder, inorder", sample_traversals()[1:])
+def test_lca_index_matches_legacy(preorder, inorder):
+    old = legacy.construct_binary_tree(preorder[:], inorder[:])
+    index = LCAIndex(construct_binary_tree(preorder, inorder))
+    assert len(index) == len(preorder)
+    pairs = _pairs(preorder, seed=len(preorder))
+    expected = [lca_val(legacy.find_lca(old, p, q)) for p, q in pairs]
+    assert [index.query(p, q).val for p, q in pairs] == expected
+    assert [node.val for node in index.query_many(pairs)] == expected
+
+
+def test_lca_index_returns_the_tree_nodes():
+    root = construct_binary_tree([1, 2, 4, 5, 3, 6], [4, 2, 5, 1, 6, 3])
+    index = LCAIndex(root)
+    assert index.query(4, 5) is root.left
+    assert index.query(4, 6) is root
+    assert index.query(6, 6) is root.right.left
+    assert index.query(3, 6) is root.right
+
+
+def test_lca_index_rejects_missing_values():
+    index = LCAIndex(construct_binary_tree([1, 2, 3], [2, 1, 3]))
+    assert 2 in index and 9 not in index
+    with pytest.raises(ValueError, match="9"):
+        index.query(2, 9)
+    with pytest.raises(ValueError, match="9"):
+        index.query_many([(2, 3), (9, 3)])
+    assert [lca_val(node) for node in index.query_many([(2, 3), (9, 3)], default=None)] == [1, None]
+
+
+def test_empty_lca_index():
+    index = LCAIndex(None)
+    assert len(index) == 0
+    assert index.query_many([(1, 2)], default=None) == [None]
+    with pytest.raises(ValueError):
+        index.query(1, 1)
+
+
+def test_lca_index_on_a_deep_chain():
+    n = 50000
+    index = LCAIndex(construct_binary_tree(list(range(n)), list(range(n))))
+    assert index.query(n - 1, n // 2).val == n // 2
+    assert index.query(0, n - 1).val == 0
+
+
+@pytest.mark.parametrize("preorder, inorder", sample_traversals()[1:])
+def test_offline_lca_matches_the_index(preorder, inorder):
+    root = construct_binary_tree(preorder, inorder)
+    pairs = _pairs(preorder, seed=len(preorder) + 1)
+    answers = offline_lca(root, iter(pairs))
+    expected = LCAIndex(root).query_many(pairs)
+    assert len(answers) == len(expected)
+    assert all(answer is node for answer, node in zip(answers, expected))
+
+
+def test_offline_lca_answers_repeated_and_self_pairs_in_input_order():
+    root = construct_binary_tree([1, 2, 4, 5, 3, 6], [4, 2, 5, 1, 6, 3])
+    pairs = [(5, 4), (4, 5), (6, 6), (1, 6), (4, 5), (2, 2), (6, 4)]
+    assert [node.val for node in offline_lca(root, pairs)] == [2, 2, 6, 1, 2, 2, 1]
+
+
+def test_offline_lca_missing_values():
+    root = construct_binary_tree([1, 2, 3], [2, 1, 3])
+    with pytest.raises(ValueError, match="9"):
+        offline_lca(root, [(2, 3), (9, 3)])
+    with pytest.raises(ValueError, match="9"):
+        offline_lca(root, [(3, 9)])
+    assert [lca_val(node) for node in offline_lca(root, [(2, 3), (9, 3)], default=None)] == [1, None]
+    assert offline_lca(None, [(1, 2)], default=None) == [None]
+    assert offline_lca(root, []) == []
+
+
+def test_offline_lca_on_a_deep_chain():
+    n = 50000
+    root = construct_binary_tree(list(range(n)), list(range(n - 1, -1, -1)))
+    answers = offline_lca(root, [(n - 1, n // 2), (0, n - 1)])
+    assert [node.val for node in answers] == [n // 2, 0]
@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from reference import (
+    LazyTree,
+    SubtreeMemo,
+    construct_binary_tree,
+    construct_keyed_tree,
+    find_height_and_diameter,
+    is_balanced,
+    legacy,
+    subtree_hash,
+)
+from reference.generator import random_traversals
+
+SAMPLE = [1, 2, 4, 5, 3, 6], [4, 2, 5, 1, 6, 3]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_memoized_metrics_match_plain_ones(seed):
+    preorder, inorder = random_traversals(seed * 13, seed)
+    old = legacy.construct_binary_tree(preorder[:], inorder[:])
+    expected = legacy.find_height_and_diameter(old), legacy.is_balanced(old)
+    memo = SubtreeMemo(min_size=4)
+    for _ in range(2):
+        for root in (
+            construct_keyed_tree(preorder, inorder),
+            construct_binary_tree(preorder, inorder),
+            LazyTree(preorder, inorder).root,
+        ):
+            assert (find_height_and_diameter(root, memo), is_balanced(root, memo)) == expected
+            assert subtree_hash(root) == subtree_hash(old)
+
+
+@pytest.mark.parametrize("build", [construct_keyed_tree, construct_binary_tree])
+def test_rebuilt_sample_tree_hits_with_the_default_min_size(build):
+    memo = SubtreeMemo()
+    assert find_height_and_diameter(build(*SAMPLE), memo) == (3, 5)
+    assert memo.info().hits == 0
+    assert find_height_and_diameter(build(*SAMPLE), memo) == (3, 5)
+    assert is_balanced(build(*SAMPLE), memo)
+    assert memo.info()[:2] == (2, 1)
+
+
+def test_keyed_regrade_is_one_lookup():
+    preorder, inorder = random_traversals(5000, 1)
+    memo = SubtreeMemo()
+    find_height_and_diameter(construct_keyed_tree(preorder, inorder), memo)
+    misses = memo.misses
+    find_height_and_diameter(construct_keyed_tree(preorder, inorder), memo)
+    assert (memo.hits, memo.misses) == (1, misses)
+
+
+def test_memo_stays_bounded():
+    memo = SubtreeMemo(maxsize=10, min_size=1)
+    find_height_and_diameter(construct_binary_tree(*random_traversals(500, 2)), memo)
+    assert len(memo) == memo.info().currsize == 10
+    memo.clear()
+    assert memo.info() == (0, 0, 10, 0)
+
+
+def test_int_keys_do_not_depend_on_the_hash_seed():
+    code = "from reference import *; print(subtree_hash(construct_binary_tree(*%r)))" % (SAMPLE,)
+    keys = set()
+    for seed in ("1", "2"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        keys.add(subprocess.check_output([sys.executable, "-c", code], env=env, text=True))
+    assert keys == {"%d\n" % subtree_hash(construct_binary_tree(*SAMPLE))}
+
+
+def test_changed_tree_is_not_answered_from_an_earlier_call():
+    memo = SubtreeMemo()
+    root = construct_binary_tree(*SAMPLE)
+    assert find_height_and_diameter(root, memo) == (3, 5)
+    assert is_balanced(root, memo)
+    leaf = root.left.left
+    leaf.left = type(leaf)(7)
+    leaf.left.left = type(leaf)(8)
+    assert find_height_and_diameter(root, memo) == (5, 7)
+    assert not is_balanced(root, memo)
@@ -0,0 +1,31 @@
+import pytest
+
+from reference import CompactTree, legacy, parallel_metrics
+from reference.generator import random_traversals
+from reference.tests.helpers import sample_traversals
+
+
+def _expected(preorder, inorder):
+    old = legacy.construct_binary_tree(preorder[:], inorder[:])
+    compact = CompactTree.from_traversals(preorder, inorder)
+    leaves = sum(1 for l, r in zip(compact.left, compact.right) if l < 0 and r < 0)
+    return legacy.find_height_and_diameter(old) + (legacy.is_balanced(old), leaves)
+
+
+@pytest.mark.parametrize("preorder, inorder", sample_traversals()[:8] + [random_traversals(3000, 7)])
+def test_parallel_metrics_match_legacy(preorder, inorder):
+    tree = CompactTree.from_traversals(preorder, inorder)
+    assert parallel_metrics(tree, workers=2) == _expected(preorder, inorder)
+
+
+@pytest.mark.parametrize("min_subtrees", [1, 3, 64, 10 ** 6])
+def test_any_cut_gives_the_same_answer(min_subtrees):
+    preorder, inorder = random_traversals(500, 3)
+    tree = CompactTree.from_traversals(preorder, inorder)
+    assert parallel_metrics(tree, workers=2, min_subtrees=min_subtrees) == _expected(preorder, inorder)
+
+
+def test_deep_chain_without_recursion():
+    n = 100000
+    tree = CompactTree.from_traversals(list(range(n)), list(range(n)))
+    assert parallel_metrics(tree, workers=2) == (n, n, False, 1)
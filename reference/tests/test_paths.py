@@ -0,0 +1,24 @@
+import pytest
+
+from reference import PathSet, construct_binary_tree, iter_all_paths, legacy
+from reference.generator import random_traversals
+from reference.tests.helpers import relabel, sample_traversals
+
+
+@pytest.mark.parametrize("preorder, inorder", sample_traversals())
+def test_paths_match_legacy(preorder, inorder):
+    root = construct_binary_tree(preorder, inorder)
+    expected = legacy.print_all_paths(legacy.construct_binary_tree(preorder[:], inorder[:]))
+    assert list(iter_all_paths(root)) == expected
+    paths = PathSet.from_node(root)
+    assert len(paths) == len(expected)
+    assert list(paths) == expected
+    if expected:
+        assert paths[-1] == expected[-1]
+
+
+@pytest.mark.parametrize("convert", [str, float, bool, lambda val: val + 2 ** 70])
+def test_non_int64_values(convert):
+    root = relabel(construct_binary_tree(*random_traversals(60, 3)), convert)
+    # repr, since 1 == True would hide a bool stored as an int
+    assert repr(list(PathSet.from_node(root))) == repr(legacy.print_all_paths(root))
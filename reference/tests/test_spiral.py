@@ -0,0 +1,29 @@
+import pytest
+
+from reference import CompactTree, SpiralOrder, construct_binary_tree, legacy, level_order_spiral
+from reference.generator import random_traversals
+from reference.tests.helpers import relabel, sample_traversals
+
+
+@pytest.mark.parametrize("preorder, inorder", sample_traversals())
+def test_spiral_order_matches_legacy(preorder, inorder):
+    root = construct_binary_tree(preorder, inorder)
+    expected = legacy.level_order_spiral(legacy.construct_binary_tree(preorder[:], inorder[:]))
+    spiral = SpiralOrder.from_node(root)
+    assert spiral.to_lists() == expected
+    assert [level.tolist() for level in spiral] == expected
+    assert SpiralOrder.from_compact(CompactTree.from_traversals(preorder, inorder)).to_lists() == expected
+    assert spiral.view().tolist() == [val for level in expected for val in level]
+    if expected:
+        assert spiral[-1].tolist() == expected[-1]
+    with pytest.raises(IndexError):
+        spiral[len(expected)]
+
+
+@pytest.mark.parametrize("convert", [str, float, bool, lambda val: val + 2 ** 70])
+def test_non_int64_values(convert):
+    root = relabel(construct_binary_tree(*random_traversals(60, 3)), convert)
+    # repr, since 1 == True would hide a bool stored as an int
+    assert repr(level_order_spiral(root)) == repr(legacy.level_order_spiral(root))
+    spiral = SpiralOrder.from_node(root)
+    assert spiral.to_lists() == list(spiral) == legacy.level_order_spiral(root)
@@ -0,0 +1,196 @@
+import random
+
+import pytest
+
+from reference import (
+    CompactTree,
+    TraversalError,
+    construct_binary_tree,
+    construct_binary_tree_from_level_order,
+    construct_binary_tree_with_duplicates,
+    find_diameter_path,
+    find_height_and_diameter,
+    find_lca,
+    is_balanced,
+    legacy,
+    level_order_spiral,
+    print_all_paths,
+    to_level_order,
+)
+from reference.generator import SHAPES, generate_traversals, random_traversals
+from reference.tests.helpers import SEEDS, lca_val, sample_traversals, traversals
+
+
+@pytest.mark.parametrize("preorder, inorder", sample_traversals())
+def test_builder_matches_legacy(preorder, inorder):
+    copies = preorder[:], inorder[:]
+    root = construct_binary_tree(preorder, inorder)
+    old = legacy.construct_binary_tree(preorder[:], inorder[:])
+    assert traversals(root) == traversals(old) == (preorder, inorder)
+    assert (preorder, inorder) == copies
+    assert traversals(construct_binary_tree_with_duplicates(preorder, inorder)) == (preorder, inorder)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_repeated_values_split_at_first_occurrence_like_legacy(seed):
+    rng = random.Random(seed)
+    preorder, inorder = random_traversals(rng.randint(1, 60), seed)
+    # A BST with equal keys on the right, plus arbitrary small labels.
+    for keys in (sorted(rng.randrange(8) for _ in inorder), [rng.randrange(3) for _ in inorder]):
+        relabel = dict(zip(inorder, keys))
+        pre, ino = [relabel[v] for v in preorder], [relabel[v] for v in inorder]
+        try:
+            old = legacy.construct_binary_tree(pre[:], ino[:])
+        except ValueError:
+            with pytest.raises(TraversalError) as info:
+                construct_binary_tree(pre, ino)
+            assert info.value.kind == "duplicate"
+            continue
+        if traversals(old) != (pre, ino):
+            continue
+        assert to_level_order(construct_binary_tree(pre, ino)) == to_level_order(old)
+        compact = CompactTree.from_traversals(pre, ino)
+        assert to_level_order(compact.to_node()) == to_level_order(old)
+
+
+def test_repeated_values_examples():
+    for preorder, inorder in [([5, 3, 5, 7], [3, 5, 5, 7]), ([1, 1], [1, 1])]:
+        old = legacy.construct_binary_tree(preorder[:], inorder[:])
+        assert to_level_order(construct_binary_tree(preorder, inorder)) == to_level_order(old)
+        assert traversals(construct_binary_tree(preorder, inorder)) == (preorder, inorder)
+    # A tree exists (1 -> left 1 -> left 0), but not with the first 1 as root split.
+    with pytest.raises(TraversalError) as info:
+        construct_binary_tree([1, 1, 0], [0, 1, 1])
+    assert (info.value.kind, info.value.index) == ("duplicate", 1)
+    with pytest.raises(TraversalError) as info:
+        construct_binary_tree([1, 1, 0], [0, 1, 1], validate=True)
+    assert info.value.kind == "duplicate"
+
+
+@pytest.mark.parametrize("preorder, inorder", sample_traversals())
+def test_traversals_match_legacy(preorder, inorder):
+    root = construct_binary_tree(preorder, inorder)
+    old = legacy.construct_binary_tree(preorder[:], inorder[:])
+    assert find_height_and_diameter(root) == legacy.find_height_and_diameter(old)
+    assert is_balanced(root) == legacy.is_balanced(old)
+    assert level_order_spiral(root) == legacy.level_order_spiral(old)
+    assert print_all_paths(root) == legacy.print_all_paths(old)
+    rng = random.Random(len(preorder))
+    for _ in range(10):
+        p, q = rng.randint(-1, len(preorder)), rng.randint(-1, len(preorder))
+        assert lca_val(find_lca(root, p, q)) == lca_val(legacy.find_lca(old, p, q))
+
+
+@pytest.mark.parametrize("preorder, inorder", sample_traversals())
+def test_level_order_round_trip(preorder, inorder):
+    root = construct_binary_tree(preorder, inorder)
+    values = to_level_order(root)
+    assert traversals(construct_binary_tree_from_level_order(values)) == (preorder, inorder)
+    assert not values or values[-1] is not None
+
+
+def test_level_order_loader_matches_leetcode_lists():
+    root = construct_binary_tree_from_level_order([1, 2, 3, None, 4, None, 5, 6])
+    assert traversals(root) == ([1, 2, 4, 6, 3, 5], [2, 6, 4, 1, 3, 5])
+    assert to_level_order(root) == [1, 2, 3, None, 4, None, 5, 6]
+    assert construct_binary_tree_from_level_order([None, None]) is None
+    for values in ([None, 1], [1, None, None, 2]):
+        with pytest.raises(ValueError):
+            construct_binary_tree_from_level_order(values)
+
+
+@pytest.mark.parametrize("preorder, inorder", sample_traversals())
+def test_diameter_path_is_a_longest_path(preorder, inorder):
+    root = construct_binary_tree(preorder, inorder)
+    old = legacy.construct_binary_tree(preorder[:], inorder[:])
+    path = find_diameter_path(root)
+    assert (path.height, path.diameter) == legacy.find_height_and_diameter(old)
+    assert len(path.path) == path.diameter
+    if not root:
+        return
+    edges = set()
+    for node in _nodes(root):
+        for child in (node.left, node.right):
+            if child:
+                edges.add(frozenset((node.val, child.val)))
+    assert all(frozenset(pair) in edges for pair in zip(path.path, path.path[1:]))
+    assert len(set(path.path)) == len(path.path)
+    assert (path.path[0], path.path[-1]) == (path.start.val, path.end.val)
+    assert path.apex.val in path.path
+
+
+def _nodes(root):
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(child for child in (node.left, node.right) if child)
+
+
+def test_deep_chain_stays_off_the_c_stack():
+    n = 100000
+    root = construct_binary_tree(list(range(n)), list(range(n - 1, -1, -1)))
+    assert find_height_and_diameter(root) == (n, n)
+    assert not is_balanced(root)
+    assert len(level_order_spiral(root)) == n
+    assert print_all_paths(root) == [list(range(n))]
+    assert find_lca(root, n - 1, n - 2).val == n - 2
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_duplicate_values_rebuild_exactly(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        preorder, inorder = random_traversals(rng.randint(0, 20), rng.random())
+        repeat = rng.randint(1, 4)
+        preorder = [val % repeat for val in preorder]
+        inorder = [val % repeat for val in inorder]
+        rebuilt = construct_binary_tree_with_duplicates(preorder, inorder)
+        assert traversals(rebuilt) == (preorder, inorder)
+
+
+def test_duplicate_builder_rejects_impossible_traversals():
+    with pytest.raises(TraversalError) as info:
+        construct_binary_tree_with_duplicates([1, 2, 3], [3, 1, 2])
+    assert info.value.kind == "order"
+    with pytest.raises(TraversalError) as info:
+        construct_binary_tree_with_duplicates([1, 2, 2], [2, 1, 1])
+    assert (info.value.kind, info.value.index) == ("missing", 2)
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_duplicate_builder_handles_equal_keys_going_right_at_scale(shape):
+    preorder, inorder = generate_traversals(shape, 20000, seed=1)
+    original = construct_binary_tree(preorder, inorder)
+    # Keys rise along inorder, and only where a node has a left subtree
+    # must they rise, so every run of equal keys hangs to the right.
+    rng, keys, key = random.Random(shape), {}, 0
+    stack, node = [], original
+    while stack or node:
+        while node:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        if node.left or rng.random() < 0.01:
+            key += 1
+        keys[node.val] = key
+        node = node.right
+    preorder, inorder = [keys[v] for v in preorder], [keys[v] for v in inorder]
+    rebuilt = construct_binary_tree_with_duplicates(preorder, inorder, max_steps=0)
+    assert to_level_order(rebuilt) == [keys.get(v) for v in to_level_order(original)]
+
+
+def test_duplicate_builder_search_is_bounded():
+    # No node may split at the first 1; the search finds the tree.
+    assert to_level_order(construct_binary_tree_with_duplicates([1, 1, 0], [0, 1, 1])) == [1, 1, None, 0]
+    with pytest.raises(TraversalError) as info:
+        construct_binary_tree_with_duplicates([1, 1, 0], [0, 1, 1], max_steps=1)
+    assert info.value.kind == "search"
+    preorder, inorder = generate_traversals("random", 20000, seed=3)
+    preorder, inorder = [val % 3 for val in preorder], [val % 3 for val in inorder]
+    try:
+        rebuilt = construct_binary_tree_with_duplicates(preorder, inorder)
+    except TraversalError as exc:
+        assert exc.kind == "search"
+    else:
+        assert traversals(rebuilt) == (preorder, inorder)
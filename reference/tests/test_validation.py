@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from reference import CompactTree, TraversalError, construct_binary_tree, construct_keyed_tree, validate_traversals
+from reference.tests.helpers import sample_traversals, traversals
+
+
+@pytest.mark.parametrize("preorder, inorder, kind, traversal, index, value", [
+    ([1, 2], [1], "length", None, None, None),
+    ([1, 2, 3], [2, 1, 2], "duplicate", "inorder", 2, 2),
+    ([1, 3, 1], [3, 1, 2], "duplicate", "preorder", 2, 1),
+    ([1, 4, 3], [3, 1, 2], "missing", "preorder", 1, 4),
+])
+def test_malformed_traversals_are_located(preorder, inorder, kind, traversal, index, value):
+    for call in (validate_traversals, lambda pre, ino: construct_binary_tree(pre, ino, validate=True)):
+        with pytest.raises(TraversalError) as info:
+            call(preorder, inorder)
+        error = info.value
+        assert (error.kind, error.traversal, error.index, error.value) == (kind, traversal, index, value)
+        assert isinstance(error, ValueError)
+
+
+@pytest.mark.parametrize("preorder, inorder, kind, traversal, index, value", [
+    ([1], [1, 2], "length", None, None, None),
+    ([2], [1, 2], "length", None, None, None),
+    ([1, 4, 3], [3, 1, 2], "missing", "preorder", 1, 4),
+    ([5, 1], [1, 4], "missing", "preorder", 0, 5),
+    ([1, 2, 9], [2, 1, 3], "missing", "preorder", 2, 9),
+])
+def test_unvalidated_builds_locate_malformed_traversals(preorder, inorder, kind, traversal, index, value):
+    builds = [construct_binary_tree, construct_keyed_tree]
+    if kind == "missing":
+        builds.append(CompactTree.from_traversals)
+    for build in builds:
+        with pytest.raises(TraversalError) as info:
+            build(preorder, inorder)
+        error = info.value
+        assert (error.kind, error.traversal, error.index, error.value) == (kind, traversal, index, value)
+
+
+@pytest.mark.parametrize("preorder, inorder", sample_traversals())
+def test_valid_traversals_pass(preorder, inorder):
+    assert validate_traversals(preorder, inorder) is None
+    assert traversals(construct_binary_tree(preorder, inorder, validate=True)) == (preorder, inorder)
+
+
+@pytest.mark.parametrize("build", [
+    construct_binary_tree,
+    lambda preorder, inorder: construct_binary_tree(preorder, inorder, validate=True),
+    construct_keyed_tree,
+])
+def test_traversals_that_fit_no_tree(build):
+    with pytest.raises(TraversalError) as info:
+        build([1, 2, 3], [3, 1, 2])
+    assert info.value.kind == "order"
+    rng, rejected = random.Random(0), 0
+    for _ in range(500):
+        preorder = rng.sample(range(8), rng.randint(2, 8))
+        inorder = rng.sample(preorder, len(preorder))
+        validate_traversals(preorder, inorder)
+        try:
+            root = build(preorder, inorder)
+        except TraversalError as exc:
+            assert exc.kind == "order"
+            rejected += 1
+        else:
+            assert traversals(root) == (preorder, inorder)
+    assert 0 < rejected < 500
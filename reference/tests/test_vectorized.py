@@ -0,0 +1,26 @@
+import pytest
+
+from reference import CompactTree, legacy
+from reference.tests.helpers import sample_traversals
+
+pytest.importorskip("numpy")
+
+from reference import vectorized  # noqa: E402
+
+
+@pytest.mark.parametrize("preorder, inorder", sample_traversals())
+def test_vectorized_metrics_match_legacy(preorder, inorder):
+    old = legacy.construct_binary_tree(preorder[:], inorder[:])
+    tree = CompactTree.from_traversals(preorder, inorder)
+    height, diameter = legacy.find_height_and_diameter(old)
+    spiral, balanced = legacy.level_order_spiral(old), legacy.is_balanced(old)
+    assert vectorized.height_and_diameter(tree) == (height, diameter)
+    assert vectorized.is_balanced(tree) == balanced
+    assert vectorized.spiral_order(tree) == spiral
+    assert vectorized.tree_metrics(tree) == (height, diameter, spiral, balanced)
+
+
+def test_vectorized_deep_chain():
+    n = 20000
+    tree = CompactTree.from_traversals(list(range(n)), list(range(n - 1, -1, -1)))
+    assert vectorized.tree_metrics(tree) == (n, n, [[i] for i in range(n)], False)
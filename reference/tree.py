@@ -0,0 +1,530 @@
+"""Tree suite reference: ``TreeNode``, the builder and the graded traversals.
+
+Every function keeps the name, signature and return shape of its
+counterpart in the student-facing suite, but none of them recurse, so
+skewed trees of any depth run under the default recursion limit.
+"""
+
+import random
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, List, NamedTuple
+
+from .spiral import SpiralOrder
+from .validation import (
+    TraversalError, _length_error, _missing_error, _order_error, validate_traversals,
+)
+
+_MASK64 = (1 << 64) - 1
+_NO_TREE = object()
+
+# Default budget of the search in construct_binary_tree_with_duplicates:
+# candidate positions per node, plus a flat allowance for small trees.
+_DUPLICATE_STEPS = 4
+_DUPLICATE_SLACK = 10000
+
+
+class TreeNode:
+    def __init__(self, value):
+        self.val = value
+        self.left = None
+        self.right = None
+
+
+class DiameterPath(NamedTuple):
+    """A longest path: where it starts, bends and ends, and its values.
+
+    ``start`` is the deepest node on the apex's left side and ``end`` the
+    deepest on its right; either is the apex itself when that side is
+    empty. ``path`` runs from ``start`` through ``apex`` to ``end``.
+    """
+
+    diameter: int
+    height: int
+    start: Any
+    apex: Any
+    end: Any
+    path: List[int]
+
+
+def construct_binary_tree(preorder, inorder, validate=False):
+    """Build a tree from its preorder and inorder traversals in O(n).
+
+    Each inorder position is looked up in a value-to-index map and the
+    preorder list is consumed through a moving cursor, so no list is
+    sliced or popped. Subtrees are described by inorder index bounds and
+    kept on an explicit stack, which keeps skewed inputs off the C stack.
+    Neither input list is modified.
+
+    Repeated values are allowed, as in the student-facing builder: a node
+    splits its subtree at the first inorder occurrence of its value
+    inside the subtree's bounds, found by a per-value cursor that only
+    moves right, so the build stays O(n). If no occurrence lies inside,
+    ``TraversalError`` is raised with kind ``"duplicate"``, since another
+    choice of occurrence may still fit;
+    :func:`construct_binary_tree_with_duplicates` tries them.
+
+    With ``validate=True`` the traversals are checked first and
+    malformed input raises :class:`~reference.validation.TraversalError`
+    before anything is built. Without it, a value missing from inorder or
+    a preorder that runs out is still reported as ``TraversalError``
+    (kinds ``"missing"`` and ``"length"``) once the build reaches it.
+    Traversals whose values agree but fit no tree are only found while
+    building; they raise ``TraversalError`` with kind ``"order"`` whether
+    or not ``validate`` is set.
+    """
+    if validate:
+        validate_traversals(preorder, inorder)
+    nodes = _build_nodes(preorder, inorder, TreeNode)
+    return nodes[0] if nodes else None
+
+
+def _build_nodes(preorder, inorder, node_type):
+    """Do the work of ``construct_binary_tree``; return the nodes in preorder."""
+    if not preorder or not inorder:
+        return []
+
+    index, repeats = _inorder_index(inorder)
+    root = node_type(preorder[0])
+    nodes = [root]
+    cursor = 1
+
+    # Frames are (parent, is_right, lo, hi). The left frame is pushed last
+    # so the whole left subtree is consumed from preorder before the right.
+    stack = []
+    # Without validation a value missing from inorder fails the index
+    # lookup and a short preorder runs out under the cursor; both become
+    # TraversalError here, at no cost to the loop.
+    try:
+        mid = index[root.val]
+        if mid < len(inorder) - 1:
+            stack.append((root, True, mid + 1, len(inorder) - 1))
+        if mid > 0:
+            stack.append((root, False, 0, mid - 1))
+
+        while stack:
+            parent, is_right, lo, hi = stack.pop()
+            node = node_type(preorder[cursor])
+            nodes.append(node)
+            cursor += 1
+            if is_right:
+                parent.right = node
+            else:
+                parent.left = node
+
+            mid = index[node.val]
+            if not lo <= mid <= hi:
+                mid = repeats.first_in_range(node.val, lo, hi) if repeats else -1
+                if mid < 0:
+                    raise _order_error(cursor - 1, node.val, repeats is not None)
+            if mid < hi:
+                stack.append((node, True, mid + 1, hi))
+            if mid > lo:
+                stack.append((node, False, lo, mid - 1))
+    except KeyError:
+        raise _missing_error(cursor - 1, preorder[cursor - 1]) from None
+    except IndexError:
+        raise _length_error(preorder, inorder) from None
+    return nodes
+
+
+def _inorder_index(inorder):
+    """Return ``(index, repeats)`` for the builders.
+
+    ``index`` maps each value to its first inorder position. ``repeats``
+    is ``None`` when the values are distinct, and otherwise a
+    :class:`_RepeatedPositions` over all of them.
+    """
+    index = {val: i for i, val in enumerate(inorder)}
+    if len(index) == len(inorder):
+        return index, None
+    repeats = _RepeatedPositions(inorder)
+    for val, positions in repeats.positions.items():
+        index[val] = positions[0]
+    return index, repeats
+
+
+class _RepeatedPositions:
+    """Every inorder position of every value, each list read left to right.
+
+    A builder asks for the first position of a value inside a subtree's
+    bounds. Positions left of those bounds belong to subtrees already
+    built, and later requests for the same value never lie further left,
+    so each value keeps a cursor that only moves right and a whole build
+    costs O(n) in total.
+    """
+
+    __slots__ = ("positions", "_next")
+
+    def __init__(self, inorder):
+        self.positions = {}
+        for i, val in enumerate(inorder):
+            self.positions.setdefault(val, []).append(i)
+        self._next = dict.fromkeys(self.positions, 0)
+
+    def first_in_range(self, val, lo, hi):
+        """Return the first position of ``val`` in ``[lo, hi]``, or -1."""
+        positions = self.positions.get(val)
+        if positions is None:
+            return -1
+        k = self._next[val]
+        while k < len(positions) and positions[k] < lo:
+            k += 1
+        self._next[val] = k
+        return positions[k] if k < len(positions) and positions[k] <= hi else -1
+
+
+def construct_binary_tree_with_duplicates(preorder, inorder, max_steps=None):
+    """Build a tree whose traversals may repeat values.
+
+    The build first splits every node at the first inorder occurrence of
+    its value inside its subtree, exactly as :func:`construct_binary_tree`
+    does, in O(n). That rebuilds the original tree whenever no node
+    repeats its own value in its left subtree, which covers distinct
+    values and the "equal keys go right" BST convention.
+
+    Other layouts can need a later occurrence, so when that first pass
+    fails a search takes over. Only some positions of a node's value split
+    the rest into a left and right subtree holding the same values in
+    both traversals. That test is O(1) per candidate: every value gets a
+    random 64-bit tag, and a stretch of either traversal is summarized by
+    prefix sums of the tags. Candidates are tried leftmost first, and a
+    split whose subtrees turn out not to be buildable is abandoned for the
+    next one. Every subproblem's outcome is remembered, so none is
+    searched twice. The search can still grow much faster than n, so it
+    stops after ``max_steps`` candidate positions, by default four per
+    node plus ten thousand, and raises
+    :class:`~reference.validation.TraversalError` with kind ``"search"``.
+
+    Subproblems are generators on an explicit stack, so skewed trees stay
+    off the C stack. Raises ``TraversalError`` if the traversals hold
+    different values (``"missing"``) or no tree has both of them
+    (``"order"``).
+    """
+    if len(preorder) != len(inorder):
+        raise TraversalError(
+            "length", f"preorder has {len(preorder)} values but inorder has {len(inorder)}",
+        )
+    counts = Counter(inorder)
+    if counts != Counter(preorder):
+        for i, val in enumerate(preorder):
+            counts[val] -= 1
+            if counts[val] < 0:
+                raise TraversalError(
+                    "missing", f"preorder[{i}] = {val!r} is not matched in inorder", "preorder", i, val,
+                )
+    try:
+        nodes = _build_nodes(preorder, inorder, TreeNode)
+    except TraversalError as exc:
+        if exc.kind != "duplicate":
+            raise
+    else:
+        return nodes[0] if nodes else None
+    if max_steps is None:
+        max_steps = _DUPLICATE_STEPS * len(inorder) + _DUPLICATE_SLACK
+
+    rng, tags, positions = random.Random(), {}, {}
+    for i, val in enumerate(inorder):
+        if val not in tags:
+            tags[val] = rng.getrandbits(64)
+            positions[val] = []
+        positions[val].append(i)
+    pre_sums, in_sums = [0], [0]
+    for sums, values in ((pre_sums, preorder), (in_sums, inorder)):
+        total = 0
+        for val in values:
+            total = (total + tags[val]) & _MASK64
+            sums.append(total)
+
+    # (a, lo, size) -> root of the built subtree, or _NO_TREE.
+    solved = {}
+    steps = 0
+
+    def subtree(a, lo, size):
+        # Builds preorder[a:a + size] / inorder[lo:lo + size]; yields the
+        # child subproblems and is sent their roots, or _NO_TREE.
+        nonlocal steps
+        val = preorder[a]
+        occurrences = positions[val]
+        pre_base, in_base = pre_sums[a + 1], in_sums[lo]
+        k = bisect_left(occurrences, lo)
+        while k < len(occurrences) and occurrences[k] < lo + size:
+            steps += 1
+            if steps > max_steps:
+                raise TraversalError(
+                    "search", f"gave up after {max_steps} steps; pass a larger max_steps to search further",
+                )
+            mid = occurrences[k]
+            k += 1
+            left_size = mid - lo
+            if (in_sums[mid] - in_base) & _MASK64 != (pre_sums[a + 1 + left_size] - pre_base) & _MASK64:
+                continue
+            left = yield a + 1, lo, left_size
+            if left is _NO_TREE:
+                continue
+            right = yield a + 1 + left_size, mid + 1, size - 1 - left_size
+            if right is _NO_TREE:
+                continue
+            node = TreeNode(val)
+            node.left, node.right = left, right
+            solved[a, lo, size] = node
+            return node
+        solved[a, lo, size] = _NO_TREE
+        return _NO_TREE
+
+    stack, result = [subtree(0, 0, len(inorder))], None
+    while stack:
+        try:
+            request = stack[-1].send(result)
+        except StopIteration as done:
+            stack.pop()
+            result = done.value
+            continue
+        if not request[2]:
+            result = None
+        elif request in solved:
+            result = solved[request]
+        else:
+            stack.append(subtree(*request))
+            result = None
+    if result is _NO_TREE:
+        raise TraversalError("order", "no binary tree has both of these traversals")
+    return result
+
+
+def construct_binary_tree_from_level_order(values):
+    """Build a tree from a LeetCode-style level-order list in O(n).
+
+    ``values`` lists the root and then, for each non-``None`` node in
+    breadth-first order, its left and right child, with ``None`` for a
+    missing child; trailing ``None`` entries may be dropped. Only real
+    nodes take list slots, so sparse trees cost nothing for their gaps.
+    Raises ``ValueError`` if values are left over with no parent slot.
+    """
+    n = len(values)
+    if not n or values[0] is None:
+        if any(val is not None for val in values):
+            raise ValueError("level-order list has values below a missing root")
+        return None
+    root = TreeNode(values[0])
+    # Appending while iterating visits the new nodes in breadth-first order.
+    nodes, i = [root], 1
+    for node in nodes:
+        if i >= n:
+            break
+        val = values[i]
+        if val is not None:
+            node.left = TreeNode(val)
+            nodes.append(node.left)
+        if i + 1 < n:
+            val = values[i + 1]
+            if val is not None:
+                node.right = TreeNode(val)
+                nodes.append(node.right)
+        i += 2
+    if i < n and any(values[j] is not None for j in range(i, n)):
+        raise ValueError(f"level-order value at index {i} has no parent")
+    return root
+
+
+def to_level_order(root):
+    """Return the level-order list that :func:`construct_binary_tree_from_level_order` reads.
+
+    Missing children of real nodes are ``None`` and trailing ``None``
+    entries are dropped, as in LeetCode's serialization.
+    """
+    values, queue = [], [root] if root else []
+    for node in queue:
+        if node is None:
+            values.append(None)
+            continue
+        values.append(node.val)
+        queue.append(node.left)
+        queue.append(node.right)
+    while values and values[-1] is None:
+        values.pop()
+    return values
+
+
+def find_height_and_diameter(root, memo=None):
+    """Return ``(height, diameter)``, both counted in nodes.
+
+    Post-order walk over an explicit stack; child heights are kept on a
+    separate results stack, so the depth of the tree never touches the
+    interpreter's recursion limit. With a
+    :class:`~reference.memo.SubtreeMemo`, subtrees seen before are taken
+    from it; on a tree from :func:`~reference.memo.construct_keyed_tree`
+    they are not walked at all.
+    """
+    if memo is not None:
+        height, diameter, _ = memo.metrics(root)
+        return height, diameter
+    if root is None:
+        return 0, 0
+
+    heights, diameter = [], 0
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            right_height = heights.pop() if node.right else 0
+            left_height = heights.pop() if node.left else 0
+            diameter = max(diameter, left_height + right_height + 1)
+            heights.append(1 + max(left_height, right_height))
+        else:
+            stack.append((node, True))
+            if node.right:
+                stack.append((node.right, False))
+            if node.left:
+                stack.append((node.left, False))
+    return heights[0], diameter
+
+
+def find_diameter_path(root):
+    """Return a :class:`DiameterPath` for the tree's longest path.
+
+    The post-order walk of ``find_height_and_diameter`` also carries the
+    deepest node of every subtree, so the best apex and its two endpoints
+    are known when the walk ends. Parent links are recorded as children
+    are pushed, and the path is rebuilt by climbing from both endpoints
+    to the apex, in O(diameter). ``diameter`` and ``height`` match
+    ``find_height_and_diameter``. On ties the apex first in preorder and
+    the leftmost deepest endpoints win, as in
+    :meth:`~reference.compact.CompactTree.diameter_path`.
+    """
+    if root is None:
+        return DiameterPath(0, 0, None, None, None, [])
+
+    parent, results = {root: None}, []
+    diameter, start, apex, end, apex_order = 0, None, None, None, 0
+    # Frames are (node, preorder number), with -1 until the node is expanded.
+    stack, order = [(root, -1)], 0
+    while stack:
+        node, pre = stack.pop()
+        if pre >= 0:
+            right_height, right_deepest = results.pop() if node.right else (0, node)
+            left_height, left_deepest = results.pop() if node.left else (0, node)
+            length = left_height + right_height + 1
+            if length > diameter or length == diameter and pre < apex_order:
+                diameter, apex_order = length, pre
+                start, apex, end = left_deepest, node, right_deepest
+            if left_height >= right_height:
+                results.append((1 + left_height, left_deepest))
+            else:
+                results.append((1 + right_height, right_deepest))
+        else:
+            stack.append((node, order))
+            order += 1
+            if node.right:
+                parent[node.right] = node
+                stack.append((node.right, -1))
+            if node.left:
+                parent[node.left] = node
+                stack.append((node.left, -1))
+
+    path, node = [], start
+    while node is not apex:
+        path.append(node.val)
+        node = parent[node]
+    path.append(apex.val)
+    tail, node = [], end
+    while node is not apex:
+        tail.append(node.val)
+        node = parent[node]
+    path.extend(reversed(tail))
+    return DiameterPath(diameter, results[0][0], start, apex, end, path)
+
+
+def level_order_spiral(root):
+    """Return levels in zig-zag order as nested lists.
+
+    Thin adapter over :class:`~reference.spiral.SpiralOrder`, which keeps
+    the same order in one flat buffer.
+    """
+    return SpiralOrder.from_node(root).to_lists()
+
+
+def is_balanced(root, memo=None):
+    """Return whether every node's subtrees differ in height by at most one.
+
+    Accepts a :class:`~reference.memo.SubtreeMemo` like
+    ``find_height_and_diameter``.
+    """
+    if memo is not None:
+        return memo.metrics(root)[2]
+    if root is None:
+        return True
+
+    heights = []
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            right_height = heights.pop() if node.right else 0
+            left_height = heights.pop() if node.left else 0
+            if abs(left_height - right_height) > 1:
+                return False
+            heights.append(1 + max(left_height, right_height))
+        else:
+            stack.append((node, True))
+            if node.right:
+                stack.append((node.right, False))
+            if node.left:
+                stack.append((node.left, False))
+    return True
+
+
+def find_lca(root, p, q):
+    """Return the lowest common ancestor node of values ``p`` and ``q``.
+
+    Matches the suite's recursive definition exactly, including its
+    behaviour when only one of the values is present (that node is
+    returned) or neither is (``None``).
+    """
+    if root is None:
+        return None
+
+    found = []
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            right = found.pop() if node.right else None
+            left = found.pop() if node.left else None
+            found.append(node if left and right else left or right)
+        elif node.val == p or node.val == q:
+            found.append(node)
+        else:
+            stack.append((node, True))
+            if node.right:
+                stack.append((node.right, False))
+            if node.left:
+                stack.append((node.left, False))
+    return found[0]
+
+
+def print_all_paths(root):
+    """Return every root-to-leaf path as a list of values, left to right."""
+    return list(iter_all_paths(root))
+
+
+def iter_all_paths(root):
+    """Yield every root-to-leaf path as a fresh list, left to right.
+
+    Only the current path is held between yields, so a consumer that
+    checks and discards each path needs O(height) memory rather than the
+    O(leaves * height) that ``print_all_paths`` materializes.
+    """
+    path = []
+    stack = [(root, 0)] if root else []
+    while stack:
+        node, depth = stack.pop()
+        del path[depth:]
+        path.append(node.val)
+        if not node.left and not node.right:
+            yield list(path)
+        else:
+            if node.right:
+                stack.append((node.right, depth + 1))
+            if node.left:
+                stack.append((node.left, depth + 1))
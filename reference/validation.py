@@ -0,0 +1,94 @@
+"""Up-front checks that a preorder/inorder pair describes a tree.
+
+The builders assume both traversals hold the same distinct values. When
+they do not, a build fails deep inside with an unhelpful ``KeyError`` or
+quietly produces the wrong tree. :func:`validate_traversals` rejects bad
+input in O(n) before any node is allocated. The common, valid case runs
+entirely in C set operations; only a failure pays for locating the
+offending element.
+"""
+
+
+class TraversalError(ValueError):
+    """A preorder/inorder pair that cannot describe a tree.
+
+    ``kind`` is ``"length"``, ``"duplicate"``, ``"missing"``, ``"order"``
+    (the values agree but no tree has both traversals) or ``"search"``
+    (the duplicate-value builder ran out of steps before deciding).
+    ``traversal`` names the list at fault, and ``index`` and ``value``
+    locate the first offending element (all ``None`` for ``"length"``,
+    ``"order"`` and ``"search"``).
+    """
+
+    def __init__(self, kind, message, traversal=None, index=None, value=None):
+        super().__init__(message)
+        self.kind = kind
+        self.traversal = traversal
+        self.index = index
+        self.value = value
+
+
+def _first_duplicate(name, values):
+    seen = set()
+    for i, val in enumerate(values):
+        if val in seen:
+            return TraversalError("duplicate", f"{name}[{i}] repeats value {val!r}", name, i, val)
+        seen.add(val)
+    return None
+
+
+def _length_error(preorder, inorder):
+    return TraversalError(
+        "length", f"preorder has {len(preorder)} values but inorder has {len(inorder)}",
+    )
+
+
+def _missing_error(position, value):
+    # Also raised by the builders when a preorder value has no inorder
+    # position to look up.
+    return TraversalError(
+        "missing", f"preorder[{position}] = {value!r} does not appear in inorder",
+        "preorder", position, value,
+    )
+
+
+def _order_error(position, value, repeated=False):
+    # Raised by the builders when a preorder value's inorder position lies
+    # outside the stretch of inorder that its subtree must occupy. With
+    # repeated values that only rules out splitting at first occurrences,
+    # not every tree, so it is reported as a duplicate instead.
+    if repeated:
+        return TraversalError(
+            "duplicate",
+            f"preorder[{position}] = {value!r} is not in its subtree's stretch of inorder "
+            "when repeated values split at their first occurrence; "
+            "construct_binary_tree_with_duplicates also tries the other splits",
+            "preorder", position, value,
+        )
+    return TraversalError(
+        "order",
+        f"preorder[{position}] = {value!r} is outside its subtree in inorder; "
+        "no binary tree has both of these traversals",
+    )
+
+
+def validate_traversals(preorder, inorder):
+    """Raise :class:`TraversalError` unless the traversals can form one tree.
+
+    Checks equal length, no repeated values in either traversal, and the
+    same set of values in both. Whether the order of the values fits a
+    tree is checked by the builders as they go, at no extra cost, and
+    reported with kind ``"order"``.
+    """
+    if len(preorder) != len(inorder):
+        raise _length_error(preorder, inorder)
+    in_set = set(inorder)
+    if len(in_set) != len(inorder):
+        raise _first_duplicate("inorder", inorder)
+    pre_set = set(preorder)
+    if len(pre_set) != len(preorder):
+        raise _first_duplicate("preorder", preorder)
+    if pre_set != in_set:
+        for i, val in enumerate(preorder):
+            if val not in in_set:
+                raise _missing_error(i, val)
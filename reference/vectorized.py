@@ -0,0 +1,78 @@
+"""NumPy evaluation of tree metrics over :class:`~reference.compact.CompactTree`.
+
+Instead of visiting nodes one at a time, each function works on a whole
+level at once: the BFS frontier is an index array, children are gathered
+with fancy indexing, and heights are folded from the deepest level up.
+The Python-level loop runs once per level rather than once per node, so
+this wins on bushy trees and loses on deep, narrow ones (a chain of n
+nodes still needs n iterations). ``python -m reference.bench vectorized``
+shows where the crossover falls.
+
+NumPy is an optional dependency (``pip install numpy``); this module is
+not imported by the package ``__init__``, and its tests are skipped when
+NumPy is missing. ``TreeNode`` trees from ``construct_binary_tree``
+convert with ``CompactTree.from_node``.
+"""
+
+import numpy as np
+
+
+def _levels(tree):
+    """Return the BFS frontiers of ``tree`` as index arrays, left to right."""
+    left = np.frombuffer(tree.left, dtype=np.int64)
+    right = np.frombuffer(tree.right, dtype=np.int64)
+    levels = []
+    frontier = np.zeros(1 if len(tree) else 0, dtype=np.int64)
+    while frontier.size:
+        levels.append(frontier)
+        children = np.stack((left[frontier], right[frontier]), axis=1).ravel()
+        frontier = children[children >= 0]
+    return levels
+
+
+def _fold(tree, levels):
+    """Fold heights bottom-up; return ``(height, diameter, balanced)``."""
+    left = np.frombuffer(tree.left, dtype=np.int64)
+    right = np.frombuffer(tree.right, dtype=np.int64)
+    # One spare slot at the end: a missing child (-1) reads heights[n] == 0.
+    heights = np.zeros(len(tree) + 1, dtype=np.int64)
+    diameter, balanced = 0, True
+    for frontier in reversed(levels):
+        lh = heights[left[frontier]]
+        rh = heights[right[frontier]]
+        heights[frontier] = 1 + np.maximum(lh, rh)
+        diameter = max(diameter, int((lh + rh).max()) + 1)
+        if balanced and np.abs(lh - rh).max() > 1:
+            balanced = False
+    return int(heights[0]), diameter, balanced
+
+
+def _spiral(tree, levels):
+    values = np.frombuffer(tree.values, dtype=np.int64)
+    return [
+        (values[frontier] if k % 2 == 0 else values[frontier[::-1]]).tolist()
+        for k, frontier in enumerate(levels)
+    ]
+
+
+def height_and_diameter(tree):
+    """Return ``(height, diameter)`` like ``find_height_and_diameter``."""
+    height, diameter, _ = _fold(tree, _levels(tree))
+    return height, diameter
+
+
+def is_balanced(tree):
+    """Return whether every node's subtrees differ in height by at most one."""
+    return _fold(tree, _levels(tree))[2]
+
+
+def spiral_order(tree):
+    """Return levels in zig-zag order like ``level_order_spiral``."""
+    return _spiral(tree, _levels(tree))
+
+
+def tree_metrics(tree):
+    """Return ``(height, diameter, spiral_order, balanced)`` from one BFS."""
+    levels = _levels(tree)
+    height, diameter, balanced = _fold(tree, levels)
+    return height, diameter, _spiral(tree, levels), balanced